@@ -0,0 +1,322 @@
+"""Benchmarks for loading, saving, drawing, dragging and hit-testing rosters
+
+Run from this directory:
+
+    python benchmark.py --sizes 100 1000 10000 100000 --output results.json
+    python benchmark.py --compare results.json
+
+Everything renders with Agg. By default the real PersonalityCompass is
+driven with a withdrawn Tk root. Without a display (or with --headless) the
+same hot paths are timed on the headless pieces (PeopleStore, storage,
+ScatterRenderer, GridIndex) instead.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from peopleStore import PeopleStore, get_quadrant
+from persistence import JsonStorage, SqliteStorage
+from renderer import ScatterRenderer
+from spatialIndex import GridIndex
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DRAG_STEPS = 30  # Motion events per simulated drag
+HIT_TESTS = 1000  # Clicks per find_person_at_point measurement
+
+
+def best_of(repeat, func, setup=None):
+    """Return the fastest of repeat runs of func, in seconds"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def make_storage(backend, data_dir):
+    if backend == "sqlite":
+        return SqliteStorage(data_dir)
+    return JsonStorage(data_dir)
+
+
+def write_roster(storage, size, seed=0):
+    """Save a synthetic roster of size people, returning their positions"""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(-100, 100, size=(size, 2))
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    people = {f"Person {i:06d}": {'x': float(x), 'y': float(y), 'quadrant': get_quadrant(x, y),
+                                  'date_added': now, 'last_moved': None}
+              for i, (x, y) in enumerate(xy.tolist())}
+    metadata = {"last_updated": now, "total_people": size, "version": "2.2", "total_edits": 0}
+    storage.save(metadata, people)
+    storage.close()
+    return xy
+
+
+def drag_path(start, steps):
+    """Evenly spaced points from start to its mirror image through the centre"""
+    x, y = start
+    return [(x - 2 * x * i / steps, y - 2 * y * i / steps) for i in range(1, steps + 1)]
+
+
+def bench_app(size, backend, repeat):
+    """Time the real PersonalityCompass hot paths with a withdrawn Tk root"""
+    import tkinter as tk
+    from newMain import PersonalityCompass
+
+    root = tk.Tk()  # Raises TclError when there is no display
+    root.withdraw()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # The app keeps its data in ./personality_compass_data
+        try:
+            os.makedirs("personality_compass_data")
+            write_roster(make_storage(backend, "personality_compass_data"), size)
+
+            start = time.perf_counter()
+            app = PersonalityCompass(root, backend=backend)
+            app.finish_startup()  # Normally run from the first idle callback
+            finish_loading(app)
+            results = {"startup": time.perf_counter() - start}
+            app.frame_interval = 0  # Draw every drag frame instead of waiting on the Tk event loop
+
+            results["load_data"] = best_of(repeat, lambda: (app.load_data(), finish_loading(app)),
+                                           setup=lambda: reset_roster(app))
+            app.writer.flush()
+
+            def save():
+                app.changed_people.update(app.people.names())
+                app.save_data()
+                app.writer.flush()
+            results["save_data"] = best_of(repeat, save)
+
+            def draw():
+                app.renderer.layout_key = None  # Include the label layout pass
+                app.redraw()
+            results["draw"] = best_of(repeat, draw)
+
+            # Drag someone from near the middle of the compass across it
+            name = app.index.nearest(10, 10, 50)
+            def drag():
+                person = app.people[name]
+                path = drag_path((person.x, person.y), DRAG_STEPS)
+                app.on_press(app_event(app, 'button_press_event', person.x, person.y))
+                for x, y in path:
+                    app.on_motion(app_event(app, 'motion_notify_event', x, y))
+                app.on_release(app_event(app, 'button_release_event', *path[-1]))
+            results["drag"] = best_of(repeat, drag) if name else None
+            app.writer.flush()
+
+            rng = random.Random(0)
+            clicks = [app_event(app, 'button_press_event', rng.uniform(-100, 100), rng.uniform(-100, 100))
+                      for _ in range(HIT_TESTS)]
+            results["hit_test"] = best_of(repeat, lambda: [app.find_person_at_point(e) for e in clicks]) / HIT_TESTS
+
+            results["update_listbox"] = best_of(repeat, app.update_listbox)
+
+            if app.save_pending is not None:
+                root.after_cancel(app.save_pending)
+            app.writer.close()
+        finally:
+            os.chdir(cwd)
+            root.destroy()
+    return results
+
+
+def finish_loading(app):
+    """Run the streamed load batches back to back instead of from the Tk event loop"""
+    while app.load_job is not None:
+        app.root.after_cancel(app.load_job)
+        app.load_next_batch()
+
+
+def reset_roster(app):
+    """Empty every in-memory view of the roster without logging or saving"""
+    app.cancel_loading()
+    app.renderer.clear()
+    app.index.clear()
+    app.density.clear()
+    app.stats.clear()
+    app.people.clear()
+    app.people_list.clear()
+
+
+def app_event(app, kind, x, y, button=1):
+    """Build a mouse event at compass position (x, y)"""
+    px, py = app.ax.transData.transform((x, y))
+    return MouseEvent(kind, app.canvas, px, py, button=button)
+
+
+def bench_headless(size, backend, repeat):
+    """Time the same hot paths on the Tk-free pieces the app is built from"""
+    results = {"startup": None, "update_listbox": None}
+    with tempfile.TemporaryDirectory() as tmp:
+        write_roster(make_storage(backend, tmp), size)
+
+        state = {}
+
+        def new_figure():
+            fig = Figure(figsize=(8, 6), dpi=100)
+            ax = fig.add_subplot(111)
+            ax.set_xlim(-100, 100)
+            ax.set_ylim(-100, 100)
+            state.update(fig=fig, ax=ax, canvas=FigureCanvasAgg(fig))
+
+        def load():
+            storage = make_storage(backend, tmp)
+            metadata, people_data = storage.load()
+            people = PeopleStore()
+            people.add_many((name, p['x'], p['y'], p.get('date_added', 'Unknown'), p.get('quadrant'))
+                            for name, p in people_data.items())
+            renderer = ScatterRenderer(state["ax"])
+            renderer.add_many((name, record.x, record.y) for name, record in people.items())
+            index = GridIndex()
+            for name, record in people.items():
+                index.insert(name, record.x, record.y)
+            state.update(storage=storage, metadata=metadata, people=people, renderer=renderer, index=index)
+        results["load_data"] = best_of(repeat, load, setup=new_figure)
+        people, renderer, index = state["people"], state["renderer"], state["index"]
+        fig, ax, canvas = state["fig"], state["ax"], state["canvas"]
+
+        def save():
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            snapshot = {name: {'x': record.x, 'y': record.y, 'quadrant': record.quadrant,
+                               'date_added': record.date_added, 'last_moved': now}
+                        for name, record in people.items()}
+            state["storage"].save(dict(state["metadata"], last_updated=now), snapshot)
+        results["save_data"] = best_of(repeat, save)
+        state["storage"].close()
+
+        def draw():
+            renderer.layout_key = None
+            renderer.layout_labels()
+            canvas.draw()
+        results["draw"] = best_of(repeat, draw)
+
+        name = index.nearest(10, 10, 50)
+        def drag():
+            record = people[name]
+            renderer.begin_drag(name)
+            canvas.draw()
+            background = canvas.copy_from_bbox(fig.bbox)
+            for x, y in drag_path((record.x, record.y), DRAG_STEPS):
+                people.move(name, x, y)
+                index.move(name, x, y)
+                canvas.restore_region(background)
+                renderer.move(name, x, y)
+                renderer.draw_drag()
+                canvas.blit(fig.bbox)
+            renderer.end_drag()
+            people.reclassify(name)
+            canvas.draw()
+        results["drag"] = best_of(repeat, drag) if name else None
+
+        (x0, y0), (x1, y1) = ax.transData.transform([(0, 0), (1, 1)])
+        rng = random.Random(0)
+        clicks = [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(HIT_TESTS)]
+        results["hit_test"] = best_of(repeat, lambda: [
+            index.nearest(x, y, 12, scale_x=abs(x1 - x0), scale_y=abs(y1 - y0)) for x, y in clicks]) / HIT_TESTS
+    return results
+
+
+def run(sizes, backend="json", repeat=3, headless=False):
+    """Benchmark every roster size and return the report as a dict"""
+    mode = "headless"
+    if not headless:
+        try:
+            import tkinter as tk
+            tk.Tk().destroy()
+            mode = "tk"
+        except Exception as e:
+            print(f"Tk is not available ({e}); running headless")
+
+    report = {
+        "mode": mode,
+        "backend": backend,
+        "repeat": repeat,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "results": []
+    }
+    bench = bench_app if mode == "tk" else bench_headless
+    for size in sizes:
+        results = bench(size, backend, repeat)
+        report["results"].append(dict(people=size, **results))
+        print_row(size, results)
+    return report
+
+
+METRICS = ("startup", "load_data", "save_data", "draw", "drag", "hit_test", "update_listbox")
+
+
+def format_time(seconds):
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def print_row(size, results):
+    print(f"{size:>7} people  " + "  ".join(f"{metric}={format_time(results.get(metric))}" for metric in METRICS))
+
+
+def compare(report, baseline):
+    """Print each timing as a ratio of the baseline report (above 1 is slower)"""
+    old_rows = {row["people"]: row for row in baseline["results"]}
+    for row in report["results"]:
+        old = old_rows.get(row["people"])
+        if old is None:
+            continue
+        ratios = []
+        for metric in METRICS:
+            if row.get(metric) and old.get(metric):
+                ratios.append(f"{metric}={row[metric] / old[metric]:.2f}x")
+        print(f"{row['people']:>7} people  " + "  ".join(ratios))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Personality Compass hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="roster sizes to benchmark (default: 100 1000 10000 100000)")
+    parser.add_argument("--sqlite", action="store_true", help="benchmark the SQLite storage backend")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the fastest is kept")
+    parser.add_argument("--headless", action="store_true", help="skip Tk even if a display is available")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report from an earlier run to compare against")
+    args = parser.parse_args()
+
+    report = run(args.sizes, backend="sqlite" if args.sqlite else "json",
+                 repeat=args.repeat, headless=args.headless)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
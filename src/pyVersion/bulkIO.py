@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from peopleStore import QUADRANTS
+
+
+def read_trait(value):
+    """A value on an extra axis, or 0 if it is missing or not a number"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return value if np.isfinite(value) else 0.0
+
+
+def read_people_file(path, axes=()):
+    """Read named coordinates from a CSV or JSON file
+
+    CSV files need name, x and y columns, plus optionally a column per name
+    in axes (other columns are ignored). JSON files can be a compass save
+    file ({"people": {name: {...}}}), a plain {name: {"x": ..., "y": ...}}
+    dict, or a list of {"name", "x", "y"} objects, with the extra axes in a
+    "traits" list. Returns (names, xy) with xy an (n, 2 + len(axes)) float
+    array; rows with missing or non-numeric coordinates are dropped, and
+    missing extra values are 0.
+    """
+    if os.path.splitext(path)[1].lower() == '.csv':
+        with open(path, newline='') as f:
+            rows = [(row.get('name', ''), row.get('x'), row.get('y'), [row.get(axis) for axis in axes])
+                    for row in csv.DictReader(f)]
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get('people', data)
+            rows = [(name, p.get('x'), p.get('y'), p.get('traits') or [])
+                    for name, p in data.items() if isinstance(p, dict)]
+        else:
+            rows = [(p.get('name', ''), p.get('x'), p.get('y'), p.get('traits') or [])
+                    for p in data if isinstance(p, dict)]
+
+    names = []
+    coords = []
+    for name, x, y, traits in rows:
+        name = str(name).strip()
+        try:
+            x, y = float(x), float(y)
+        except (TypeError, ValueError):
+            continue
+        if name:
+            names.append(name)
+            traits = list(traits)[:len(axes)] if isinstance(traits, list) else []
+            coords.append([x, y] + [read_trait(value) for value in traits] + [0.0] * (len(axes) - len(traits)))
+
+    xy = np.array(coords, dtype=float).reshape(-1, 2 + len(axes))
+    keep = np.isfinite(xy).all(axis=1)
+    if not keep.all():
+        names = [name for name, ok in zip(names, keep) if ok]
+        xy = xy[keep]
+    return names, xy
+
+
+def write_people_file(path, store, axes=()):
+    """Write every person in a PeopleStore to CSV or JSON, chosen by extension
+
+    axes names the store's axes after x and y; CSV files get a column per
+    axis and JSON entries a "traits" list.
+    """
+    names = [record.name for record in store.records]
+    coords = store.coords
+    quadrants = np.array(QUADRANTS)[store.codes]
+    dates = [record.date_added for record in store.records]
+    traits = store.vectors[:, 2:2 + len(axes)].tolist()
+
+    if os.path.splitext(path)[1].lower() == '.csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'x', 'y', 'quadrant', 'date_added'] + list(axes))
+            writer.writerows([name, x, y, quadrant, date_added] + values for name, x, y, quadrant, date_added, values
+                             in zip(names, coords[:, 0].tolist(), coords[:, 1].tolist(), quadrants.tolist(),
+                                    dates, traits))
+    else:
+        people = {
+            name: {'x': x, 'y': y, 'quadrant': quadrant, 'date_added': date_added}
+            for name, x, y, quadrant, date_added
+            in zip(names, coords[:, 0].tolist(), coords[:, 1].tolist(), quadrants.tolist(), dates)
+        }
+        if axes:
+            for name, values in zip(names, traits):
+                people[name]['traits'] = values
+        with open(path, 'w') as f:
+            json.dump({"people": people}, f, indent=2)
+    return len(names)
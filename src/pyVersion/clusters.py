@@ -0,0 +1,240 @@
+import math
+
+import numpy as np
+
+NOISE = -1  # Label of people dbscan leaves out of every cluster
+
+
+def kmeans(points, k, iterations=100, seed=0, centres=None, tolerance=0.05):
+    """Group an (n, 2) array into k clusters; returns (labels, centres)
+
+    Starts from centres if given (e.g. the previous result, so re-running
+    after a few edits converges in a step or two), otherwise from a
+    k-means++ pick. Each step assigns every point to its nearest centre
+    with one (n, k) distance matrix. It stops once no label changes or no
+    centre moves more than tolerance (in compass units).
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    k = min(k, n)
+    if k <= 0:
+        return np.zeros(n, dtype=int), np.empty((0, points.shape[1] if points.ndim == 2 else 2))
+
+    if centres is None or len(centres) != k:
+        centres = _plus_plus(points, k, np.random.default_rng(seed))
+    centres = np.array(centres, dtype=float)
+
+    labels = None
+    for _ in range(iterations):
+        # |p - c|^2 - |p|^2, which ranks the centres the same, without building an (n, k, 2) array
+        scores = points @ (-2 * centres.T) + (centres ** 2).sum(axis=1)
+        new_labels = scores.argmin(axis=1)
+        if labels is not None and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=column, minlength=k) for column in points.T], axis=1)
+        occupied = counts > 0
+        previous = centres.copy()
+        centres[occupied] = sums[occupied] / counts[occupied, None]
+        # A centre that lost everyone restarts at the point furthest from its own centre
+        for empty in np.flatnonzero(~occupied):
+            far = (scores[np.arange(n), labels] + (points ** 2).sum(axis=1)).argmax()
+            centres[empty] = points[far]
+            labels[far] = empty
+        if occupied.all() and np.abs(centres - previous).max() <= tolerance:
+            break
+    return labels, centres
+
+
+def _plus_plus(points, k, rng):
+    """k-means++ seeding: each new centre is picked with probability proportional to its squared distance"""
+    centres = [points[rng.integers(len(points))]]
+    nearest = ((points - centres[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = nearest.sum()
+        pick = rng.integers(len(points)) if total == 0 else rng.choice(len(points), p=nearest / total)
+        centres.append(points[pick])
+        nearest = np.minimum(nearest, ((points - points[pick]) ** 2).sum(axis=1))
+    return np.array(centres)
+
+
+def dbscan(points, eps, min_samples=5):
+    """Density clusters of an (n, 2) array; returns labels, with NOISE for people in no cluster
+
+    A point with at least min_samples points (itself included) within eps
+    is a core point. Core points within eps of each other share a cluster,
+    and other points join the cluster of the nearest core point within eps.
+    Clusters are numbered from the biggest down.
+
+    Points are binned into square cells of side eps / sqrt(2), so any two
+    points in one cell are within eps of each other and only the 21 cells
+    around a cell can hold its neighbours. A cell holding min_samples points
+    is all core without measuring anything; elsewhere distances are measured
+    in one vectorised batch per neighbour offset. Clusters are then joined
+    cell by cell: each pair of neighbouring core cells is first tried with
+    the two points facing each other, and only pairs still in different
+    clusters afterwards have all their points compared.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    labels = np.full(n, NOISE, dtype=int)
+    if n == 0 or eps <= 0:
+        return labels
+
+    side = eps / math.sqrt(2)
+    origin = points.min(axis=0)
+    cells = np.floor((points - origin) / side).astype(np.int64)
+    width = int(cells[:, 1].max()) + 5
+    keys = (cells[:, 0] + 2) * width + cells[:, 1] + 2  # Margin of 2 so neighbour keys never wrap
+    offsets = [dx * width + dy for dx in range(-2, 3) for dy in range(-2, 3) if abs(dx) + abs(dy) < 4]
+    eps2 = eps * eps
+
+    def close_pairs(source, target, cells_a, cells_b):
+        i, j = _point_pairs(source, target, cells_a, cells_b)
+        keep = ((points[i] - points[j]) ** 2).sum(axis=1) <= eps2
+        return i[keep], j[keep]
+
+    # Core points: everyone in a full cell, and anyone else with enough neighbours
+    everyone = _bin(keys, np.arange(n))
+    full = everyone[2] >= min_samples
+    core = np.zeros(n, dtype=bool)
+    core[everyone[3]] = np.repeat(full, everyone[2])
+    sparse = np.flatnonzero(~full)
+    neighbour_counts = np.zeros(n, dtype=np.int64)
+    for offset in offsets:
+        i, _ = close_pairs(everyone, everyone, *_cell_pairs(everyone, everyone, offset, sparse))
+        neighbour_counts += np.bincount(i, minlength=n)
+    core |= neighbour_counts >= min_samples
+    if not core.any():
+        return labels
+
+    # Join neighbouring core cells, trying the two points that face each other first
+    cores = _bin(keys, np.flatnonzero(core))
+    cell_keys, starts, counts, order = cores
+    centres = (np.stack([cell_keys // width, cell_keys % width], axis=1) - 2 + 0.5) * side + origin
+    linked, untried = [], []
+    for offset in offsets:
+        if offset <= 0:
+            continue  # Each pair of cells once
+        a, b = _cell_pairs(cores, cores, offset)
+        facing_a = _nearest_in_cells(points, cores, a, centres[b])
+        facing_b = _nearest_in_cells(points, cores, b, centres[a])
+        close = ((points[facing_a] - points[facing_b]) ** 2).sum(axis=1) <= eps2
+        linked.append((a[close], b[close]))
+        untried.append((a[~close], b[~close]))
+    a = np.concatenate([pair[0] for pair in untried])
+    b = np.concatenate([pair[1] for pair in untried])
+    component = _components(len(cell_keys), *_concat(linked))
+
+    # Compare every point of the pairs that are still apart, a bounded batch at a time
+    apart = component[a] != component[b]
+    a, b = a[apart], b[apart]
+    cell_of = np.empty(n, dtype=np.int64)
+    cell_of[order] = np.repeat(np.arange(len(cell_keys)), counts)
+    batches = np.cumsum(counts[a] * counts[b]) // PAIR_BATCH
+    for batch in np.unique(batches):
+        chosen = batches == batch
+        i, j = close_pairs(cores, cores, a[chosen], b[chosen])
+        linked.append((cell_of[i], cell_of[j]))
+    component = _components(len(cell_keys), *_concat(linked))
+
+    # Number the clusters by core point count, biggest first
+    sizes = np.bincount(component, weights=counts)
+    rank = np.empty(len(sizes), dtype=int)
+    present = np.flatnonzero(sizes)
+    rank[present[np.argsort(-sizes[present], kind='stable')]] = np.arange(len(present))
+    labels[order] = rank[component[cell_of[order]]]
+
+    # Border points take the cluster of their nearest core point within eps
+    others = _bin(keys, np.flatnonzero(~core))
+    i, j = _concat([close_pairs(others, cores, *_cell_pairs(others, cores, offset)) for offset in offsets])
+    if len(i):
+        nearest = np.lexsort((((points[i] - points[j]) ** 2).sum(axis=1), i))
+        first = nearest[np.r_[True, i[nearest][1:] != i[nearest][:-1]]]
+        labels[i[first]] = labels[j[first]]
+    return labels
+
+
+PAIR_BATCH = 1 << 22  # Most point pairs compared at once when joining cells
+
+
+def _bin(keys, rows):
+    """Group point indices by cell: (cell keys, start of each cell in order, counts, order)"""
+    order = rows[np.argsort(keys[rows], kind='stable')]
+    cell_keys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    return cell_keys, starts, counts, order
+
+
+def _concat(pairs):
+    """Join a list of (i, j) index array pairs into one pair of arrays"""
+    if not pairs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate([pair[0] for pair in pairs]), np.concatenate([pair[1] for pair in pairs])
+
+
+def _cell_pairs(source, target, offset, chosen=None):
+    """(source cell numbers, target cell numbers) of every source cell (or chosen one) with a target cell at offset"""
+    s_keys, t_keys = source[0], target[0]
+    if chosen is None:
+        chosen = np.arange(len(s_keys))
+    if not len(t_keys) or not len(chosen):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    wanted = s_keys[chosen] + offset
+    at = np.minimum(np.searchsorted(t_keys, wanted), len(t_keys) - 1)
+    hit = t_keys[at] == wanted
+    return chosen[hit], at[hit]
+
+
+def _members(binned, cells):
+    """Point indices of the given cells, one run per cell, and the length of each run"""
+    _, starts, counts, order = binned
+    sizes = counts[cells]
+    step = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return order[np.repeat(starts[cells], sizes) + step], sizes
+
+
+def _point_pairs(source, target, cells_a, cells_b):
+    """Every (i, j) with i in source cell cells_a[k] and j in target cell cells_b[k], for each k"""
+    across = target[2][cells_b]
+    sizes = source[2][cells_a] * across
+    cell_pair = np.repeat(np.arange(len(cells_a)), sizes)
+    step = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    i = source[3][source[1][cells_a][cell_pair] + step // across[cell_pair]]
+    j = target[3][target[1][cells_b][cell_pair] + step % across[cell_pair]]
+    return i, j
+
+
+def _nearest_in_cells(points, binned, cells, targets):
+    """For each cell in cells, its point nearest the matching row of targets"""
+    if not len(cells):
+        return np.empty(0, dtype=np.int64)
+    rows, sizes = _members(binned, cells)
+    distances = ((points[rows] - np.repeat(targets, sizes, axis=0)) ** 2).sum(axis=1)
+    run_starts = np.cumsum(sizes) - sizes
+    closest = np.minimum.reduceat(distances, run_starts)
+    candidates = np.where(distances == np.repeat(closest, sizes), np.arange(len(rows)), len(rows))
+    return rows[np.minimum.reduceat(candidates, run_starts)]
+
+
+def _components(count, u, v):
+    """Connected component of each of count nodes given edges u-v, as the smallest node number in it
+
+    Label propagation with pointer jumping: every round hooks each edge's
+    larger label onto its smaller one and then flattens the label chains.
+    """
+    label = np.arange(count)
+    while True:
+        low = np.minimum(label[u], label[v])
+        hooked = label.copy()
+        np.minimum.at(hooked, label[u], low)
+        np.minimum.at(hooked, label[v], low)
+        while True:
+            jumped = hooked[hooked]
+            if np.array_equal(jumped, hooked):
+                break
+            hooked = jumped
+        if np.array_equal(hooked, label):
+            return label
+        label = hooked
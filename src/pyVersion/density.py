@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class DensityGrid:
+    """2D histogram of positions over the compass, kept up to date per edit
+
+    counts[row, col] holds the number of people in each bin, with rows
+    running along y and columns along x (the layout imshow expects). Adding,
+    moving or removing a person only touches the bins involved, so the
+    histogram never has to be recomputed from the whole roster.
+    """
+
+    def __init__(self, bins=100, extent=(-100, 100, -100, 100)):
+        self.bins = bins
+        self.extent = extent
+        self.counts = np.zeros((bins, bins), dtype=np.int32)
+        self.version = 0  # Bumped on every change, so renderers know when to refresh
+
+    def _bin(self, x, y):
+        x_min, x_max, y_min, y_max = self.extent
+        col = int((x - x_min) / (x_max - x_min) * self.bins)
+        row = int((y - y_min) / (y_max - y_min) * self.bins)
+        return min(max(row, 0), self.bins - 1), min(max(col, 0), self.bins - 1)
+
+    def add(self, x, y):
+        self.counts[self._bin(x, y)] += 1
+        self.version += 1
+
+    def remove(self, x, y):
+        self.counts[self._bin(x, y)] -= 1
+        self.version += 1
+
+    def move(self, old_x, old_y, x, y):
+        """Shift one person between bins, doing nothing if the bin is unchanged"""
+        old_bin = self._bin(old_x, old_y)
+        new_bin = self._bin(x, y)
+        if old_bin != new_bin:
+            self.counts[old_bin] -= 1
+            self.counts[new_bin] += 1
+            self.version += 1
+
+    def add_many(self, xy):
+        """Add an (n, 2) array of positions in one vectorised pass"""
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        if not len(xy):
+            return
+        x_min, x_max, y_min, y_max = self.extent
+        cols = ((xy[:, 0] - x_min) / (x_max - x_min) * self.bins).astype(int).clip(0, self.bins - 1)
+        rows = ((xy[:, 1] - y_min) / (y_max - y_min) * self.bins).astype(int).clip(0, self.bins - 1)
+        np.add.at(self.counts, (rows, cols), 1)
+        self.version += 1
+
+    def remove_many(self, xy):
+        """Remove an (n, 2) array of positions in one vectorised pass"""
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        if not len(xy):
+            return
+        x_min, x_max, y_min, y_max = self.extent
+        cols = ((xy[:, 0] - x_min) / (x_max - x_min) * self.bins).astype(int).clip(0, self.bins - 1)
+        rows = ((xy[:, 1] - y_min) / (y_max - y_min) * self.bins).astype(int).clip(0, self.bins - 1)
+        np.subtract.at(self.counts, (rows, cols), 1)
+        self.version += 1
+
+    def rebuild(self, xy):
+        """Replace the histogram with the positions in xy"""
+        self.counts[:] = 0
+        self.add_many(xy)
+
+    def clear(self):
+        self.counts[:] = 0
+        self.version += 1
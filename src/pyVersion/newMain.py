@@ -1,37 +1,118 @@
+import time
+LAUNCHED_AT = time.perf_counter()  # Start of the time-to-first-paint measurement
+
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.patches as patches
-import json
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import argparse
 import os
 import stat
 from datetime import datetime
 import platform
+from peopleStore import QUADRANTS, PeopleStore, get_quadrant
+from bulkIO import read_people_file, write_people_file
+import numpy as np
+from renderer import COMPASS_AXES, DensityRenderer, HighlightRenderer, ScatterRenderer, style_compass
+from spatialIndex import GridIndex
+from density import DensityGrid
+from quadrantStats import QuadrantStats
+from peopleList import PeopleListView
+from persistence import BackgroundWriter, JsonStorage, SqliteStorage, write_json_atomic
+from perfMonitor import PerfMonitor
+from undoHistory import UndoHistory, delta_from_entry
+from projection import COMPASS_VIEW, PCA_VIEW
+from clusters import dbscan, kmeans
+from replay import ReplayWindow
+from syncServer import DEFAULT_ADDRESS, SyncStorage
 
 class PersonalityCompass:
-    def __init__(self, root):
+    def __init__(self, root, backend="json", label_limit=1000, sync_address=None):
         self.root = root
         self.root.title("Personality Compass")
         self.root.geometry("1000x700")
         
         # Data storage
-        self.people = {}  # {name: {'x': float, 'y': float, 'scatter': matplotlib_scatter, 'annotation': matplotlib_annotation, 'date_added': str, 'quadrant': str}}
+        self.people = PeopleStore()  # {name: PersonRecord} with trait vectors in a NumPy matrix
+        self.axis_names = list(COMPASS_AXES)  # One label per trait axis, starting with x and y
+        self.view = COMPASS_VIEW  # Pair of axes (or the PCA projection) shown on the canvas
+        self.index = GridIndex()  # Spatial buckets kept in sync with self.people for hit-testing
+        self.hit_radius = 12  # Click distance in pixels
+        self.density = DensityGrid()  # Per-bin head counts for the density view
+        self.stats = QuadrantStats()  # Per-quadrant running sums, fed by log_edit
+        self.stats_job = None  # Pending after_idle id for the statistics panel refresh
         self.dragging = None
         self.drag_offset = (0, 0)
-        self.edit_history = []  # Track all edit operations
+        self.drag_start = (0, 0)  # Position of the dragged person when the drag began
+        self.drag_background = None  # Cached canvas pixels without the dragged person
+        self.drag_frame_pending = None  # Pending root.after id for the next drag frame
+        self.last_drag_frame = 0.0
+        self.frame_interval = 1 / 60  # Drag redraws are throttled to the display frame rate
+        self.label_limit = label_limit  # Beyond this many people in view only markers are drawn
+        self.full_view = (-100, 100, -100, 100)  # x_min, x_max, y_min, y_max of the whole compass
+        self.render_box = self.full_view  # Region whose people are currently in the renderer
+        self.zoom_step = 1.2  # View scale change per scroll step
+        self.min_span = 2  # Narrowest view allowed, in compass units
+        self.panning = None  # (x, y, xlim, ylim) at the start of a pan, in pixels
+        self.edit_history = None  # Edits from earlier sessions, only read when viewed
+        self.session_edits = []  # Edits made since the window opened
+        self.edit_count = 0  # Total edits, including ones not loaded into memory
+        self.undo_history = UndoHistory()  # Inverse deltas for Ctrl+Z / Ctrl+Y
+        self.applying_undo = False  # True while an undo/redo replays a delta
+        self.applying_remote = False  # True while an edit from the sync server is applied
+        self.remote_drags = {}  # {name: (axes, values before the drag)} for people dragged in other windows
+        self.sync_poll_ms = 20  # How often messages from the sync server are applied
+        self.sync_job = None  # root.after id of the next sync poll
+        self.query_kinds = [("nearest", "Nearest neighbours (how many)"),
+                            ("within", "Everyone within (distance)"),
+                            ("kmeans", "Clusters: k-means (how many)"),
+                            ("dbscan", "Clusters: density (distance)")]
+        self.query = None  # Search highlighted on the canvas: (kind, name, amount) or (kind, amount)
+        self.query_shown = None  # (positions, cluster labels or None, centre, radius) of its last result
+        self.query_job = None  # root.after id of the next re-run after edits
+        self.query_delay_ms = 200  # Edits within this window trigger one re-run
+        self.cluster_centres = None  # Last k-means centres, so re-runs start from them
+        self.cluster_min_samples = 5  # People (themselves included) needed nearby to seed a density cluster
+        self.load_batch_size = 500  # People rendered per idle step while loading
+        self.pending_load = []  # Names loaded from disk but not yet drawn
+        self.load_job = None  # root.after id of the next load batch
+        self.save_delay_ms = 500  # Edits within this window are written in one save
+        self.save_pending = None  # root.after id of the scheduled save
+        self.dirty = False  # True when there are changes not yet written to disk
+        self.changed_people = set()  # Names added or moved since the last save
+        self.removed_people = set()  # Names removed since the last save
+        self.people_cleared = False  # Clear All was used since the last save
         
         # Create data directory and hide it
         self.data_dir = "personality_compass_data"
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
             self.hide_folder(self.data_dir)
-        self.data_file = os.path.join(self.data_dir, "people_data.json")
+        
+        # JSON snapshot + journal by default, row-level saves into SQLite, or a roster shared by syncServer.py
+        if backend == "sqlite":
+            self.storage = SqliteStorage(self.data_dir)
+        elif backend == "sync":
+            self.storage = SyncStorage(sync_address or DEFAULT_ADDRESS)
+        else:
+            self.storage = JsonStorage(self.data_dir)
+        self.sync = self.storage if backend == "sync" else None  # Set when edits are shared with other windows
+        self.writer = BackgroundWriter(self.storage)  # Writes saves off the Tk thread
+        
+        # Time the hot paths (F3 shows the figures on the canvas)
+        self.perf = PerfMonitor()
+        self.overlay_visible = False
+        self.overlay_interval = 0.25  # Seconds between overlay text refreshes
+        self.overlay_pixels = None  # Last rendered overlay, pasted back between refreshes
+        self.overlay_drawn = 0.0
+        for method in ('redraw', 'update_listbox', 'save_data', 'load_next_batch', 'draw_drag_frame',
+                       'on_press', 'on_motion', 'on_release', 'on_scroll', 'refresh_query'):
+            setattr(self, method, self.perf.wrap(method, getattr(self, method)))
         
         self.setup_gui()
-        self.setup_plot()
-        self.load_data()  # Load saved data after GUI is set up
+        
+        # Show the window first; matplotlib, the figure and the data load wait for the first idle moment
+        self.started = False
+        self.awaiting_first_paint = True
+        self.root.after_idle(self.finish_startup)
         
         # Bind window close event to save data
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -62,7 +143,58 @@ class PersonalityCompass:
         add_btn.grid(row=0, column=2, padx=(0, 10))
         
         clear_btn = ttk.Button(input_frame, text="Clear All", command=self.clear_all)
-        clear_btn.grid(row=0, column=3)
+        clear_btn.grid(row=0, column=3, padx=(0, 10))
+        
+        history_btn = ttk.Button(input_frame, text="History", command=self.show_history)
+        history_btn.grid(row=0, column=4, padx=(0, 10))
+        
+        import_btn = ttk.Button(input_frame, text="Import...", command=self.import_people)
+        import_btn.grid(row=0, column=5, padx=(0, 10))
+        
+        export_btn = ttk.Button(input_frame, text="Export...", command=self.export_people)
+        export_btn.grid(row=0, column=6, padx=(0, 10))
+        
+        reset_view_btn = ttk.Button(input_frame, text="Reset View", command=self.reset_view)
+        reset_view_btn.grid(row=0, column=7, padx=(0, 10))
+        
+        self.density_var = tk.BooleanVar(value=False)
+        density_check = ttk.Checkbutton(input_frame, text="Density view", variable=self.density_var,
+                                        command=self.toggle_density_view)
+        density_check.grid(row=0, column=8)
+        
+        # Which pair of trait axes the canvas shows
+        ttk.Label(input_frame, text="View:").grid(row=1, column=0, padx=(0, 5), pady=(5, 0))
+        self.view_box = ttk.Combobox(input_frame, state='readonly', width=45)
+        self.view_box.grid(row=1, column=1, columnspan=4, sticky=tk.W, pady=(5, 0))
+        self.view_box.bind('<<ComboboxSelected>>', lambda e: self.show_view(self.view_choices[self.view_box.current()]))
+        self.update_view_choices()
+        
+        add_axis_btn = ttk.Button(input_frame, text="Add Axis...", command=self.add_axis)
+        add_axis_btn.grid(row=1, column=5, padx=(0, 10), pady=(5, 0))
+        
+        replay_btn = ttk.Button(input_frame, text="Replay...", command=self.show_replay)
+        replay_btn.grid(row=1, column=6, padx=(0, 10), pady=(5, 0))
+        
+        # Neighbour, radius and cluster searches over the plotted positions
+        ttk.Label(input_frame, text="Find:").grid(row=2, column=0, padx=(0, 5), pady=(5, 0))
+        self.query_box = ttk.Combobox(input_frame, state='readonly', width=30,
+                                      values=[label for _, label in self.query_kinds])
+        self.query_box.current(0)
+        self.query_box.grid(row=2, column=1, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        self.query_amount_var = tk.StringVar(value="5")
+        amount_entry = ttk.Entry(input_frame, textvariable=self.query_amount_var, width=8)
+        amount_entry.grid(row=2, column=4, padx=(0, 10), pady=(5, 0))
+        amount_entry.bind('<Return>', lambda e: self.run_query())
+        
+        find_btn = ttk.Button(input_frame, text="Find", command=self.run_query)
+        find_btn.grid(row=2, column=5, padx=(0, 10), pady=(5, 0))
+        
+        clear_find_btn = ttk.Button(input_frame, text="Clear Highlight", command=self.clear_query)
+        clear_find_btn.grid(row=2, column=6, padx=(0, 10), pady=(5, 0))
+        
+        self.query_var = tk.StringVar()
+        ttk.Label(input_frame, textvariable=self.query_var).grid(row=3, column=0, columnspan=9, sticky=tk.W, pady=(5, 0))
         
         # Instructions
         instructions_frame = ttk.LabelFrame(main_frame, text="Instructions", padding="10")
@@ -72,10 +204,15 @@ class PersonalityCompass:
 • Enter: Add person after typing name
 • Delete: Remove selected person from list
 • Escape: Cancel current drag operation
+• Ctrl+Z / Ctrl+Y: Undo / redo
+• F3: Show/hide performance overlay
 
 Mouse Controls:
 • Left-click + drag: Move person on grid
 • Right-click: Remove person from grid
+• Scroll: Zoom in/out around the cursor
+• Drag empty space: Pan the view
+• Click a list heading: Sort (again to reverse)
 
 Data is automatically saved to:
 personality_compass_data/ folder"""
@@ -86,22 +223,42 @@ personality_compass_data/ folder"""
         list_frame = ttk.LabelFrame(main_frame, text="People", padding="10")
         list_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
         
-        # Listbox with scrollbar
+        # Search-as-you-type filter for the People list
+        search_frame = ttk.Frame(list_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=(0, 5))
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.search_var.trace_add('write', lambda *args: self.people_list.set_filter(self.search_var.get()))
+        
+        # People table with scrollbar (Treeview only renders the rows in view)
         list_container = ttk.Frame(list_frame)
         list_container.pack(fill=tk.BOTH, expand=True)
         
         scrollbar = ttk.Scrollbar(list_container)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.people_listbox = tk.Listbox(list_container, yscrollcommand=scrollbar.set)
-        self.people_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.people_listbox.yview)
+        self.people_tree = ttk.Treeview(list_container, columns=('x', 'y', 'quadrant'),
+                                        selectmode='browse', yscrollcommand=scrollbar.set)
+        self.people_tree.heading('#0', text='Name')
+        self.people_tree.heading('x', text='X')
+        self.people_tree.heading('y', text='Y')
+        self.people_tree.heading('quadrant', text='Quadrant')
+        self.people_tree.column('#0', width=120)
+        self.people_tree.column('x', width=45, anchor=tk.E)
+        self.people_tree.column('y', width=45, anchor=tk.E)
+        self.people_tree.column('quadrant', width=110)
+        self.people_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.people_tree.yview)
+        
+        # Name <-> row lookups, sorting (click a heading) and filtering
+        self.people_list = PeopleListView(self.people_tree)
         
         # Bind keyboard events
-        self.people_listbox.bind('<Delete>', self.delete_selected_person)
-        self.people_listbox.bind('<BackSpace>', self.delete_selected_person)
-        self.people_listbox.bind('<Double-Button-1>', self.edit_coordinates)
-        self.people_listbox.bind('<<ListboxSelect>>', self.on_person_select)
+        self.people_tree.bind('<Delete>', self.delete_selected_person)
+        self.people_tree.bind('<BackSpace>', self.delete_selected_person)
+        self.people_tree.bind('<Double-Button-1>', self.edit_coordinates)
+        self.people_tree.bind('<<TreeviewSelect>>', self.on_person_select)
         
         # Coordinate editing frame
         coord_frame = ttk.LabelFrame(list_frame, text="Edit Coordinates", padding="5")
@@ -124,6 +281,23 @@ personality_compass_data/ folder"""
         self.x_entry.bind('<Return>', lambda e: self.update_coordinates())
         self.y_entry.bind('<Return>', lambda e: self.update_coordinates())
         
+        # Live per-quadrant statistics
+        stats_frame = ttk.LabelFrame(list_frame, text="Quadrant Statistics", padding="5")
+        stats_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        self.stats_tree = ttk.Treeview(stats_frame, columns=('count', 'centroid', 'spread'), height=4)
+        self.stats_tree.heading('#0', text='Quadrant')
+        self.stats_tree.heading('count', text='People')
+        self.stats_tree.heading('centroid', text='Centroid')
+        self.stats_tree.heading('spread', text='Spread (SD)')
+        self.stats_tree.column('#0', width=110)
+        self.stats_tree.column('count', width=50, anchor=tk.E)
+        self.stats_tree.column('centroid', width=80, anchor=tk.E)
+        self.stats_tree.column('spread', width=80, anchor=tk.E)
+        self.stats_tree.pack(fill=tk.X)
+        self.stats_items = {quadrant: self.stats_tree.insert('', tk.END, text=quadrant)
+                            for quadrant in QUADRANTS}
+        
         # Plot frame
         plot_frame = ttk.Frame(main_frame)
         plot_frame.grid(row=1, column=1, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
@@ -132,52 +306,92 @@ personality_compass_data/ folder"""
         
         self.plot_container = plot_frame
         
+        # Placeholder until the figure is built
+        self.loading_label = ttk.Label(plot_frame, text="Loading compass...")
+        self.loading_label.grid(row=0, column=0)
+        
+    def finish_startup(self):
+        """Build the plot and load the data once the window is on screen"""
+        if self.started:
+            return
+        self.started = True
+        self.perf.record("startup.window_shown", time.perf_counter() - LAUNCHED_AT)
+        
+        self.setup_plot()
+        self.load_data()  # Load saved data after GUI is set up
+        if self.sync is not None:
+            self.poll_sync()
+        
     def setup_plot(self):
+        # matplotlib is only imported once the window is already showing
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
         # Create matplotlib figure
         self.fig = Figure(figsize=(8, 6), dpi=100, facecolor='white')
         self.ax = self.fig.add_subplot(111)
         
-        # Set up the plot
-        self.ax.set_xlim(-100, 100)
-        self.ax.set_ylim(-100, 100)
-        self.ax.set_xlabel('Not ← → Gnatty', fontsize=12, fontweight='bold')
-        self.ax.set_ylabel('Non NPC ← → NPC', fontsize=12, fontweight='bold')
-        self.ax.set_title('Personality Compass', fontsize=14, fontweight='bold', pad=20)
-        
-        # Add grid
-        self.ax.grid(True, alpha=0.3)
-        
-        # Add quadrant lines
-        self.ax.axhline(y=0, color='black', linewidth=1.5, alpha=0.8)
-        self.ax.axvline(x=0, color='black', linewidth=1.5, alpha=0.8)
-        
-        # Add quadrant labels
-        self.ax.text(110, 50, 'Gnatty,\nNPC', ha='center', va='center', 
-                    fontsize=10, alpha=0.6, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor='lightblue', alpha=0.5))
-        self.ax.text(-110, 50, 'Not,\nNPC', ha='center', va='center', 
-                    fontsize=10, alpha=0.6, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor='lightcoral', alpha=0.5))
-        self.ax.text(-110, -50, 'Not,\nNon NPC', ha='center', va='center', 
-                    fontsize=10, alpha=0.6, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgreen', alpha=0.5))
-        self.ax.text(110, -50, 'Gnatty,\nNon NPC', ha='center', va='center', 
-                    fontsize=10, alpha=0.6, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor='lightyellow', alpha=0.5))
+        # Axes, grid, centre lines and quadrant labels
+        self.quadrant_labels = style_compass(self.ax)
+        
+        # Every person is drawn from one shared scatter collection
+        self.renderer = ScatterRenderer(self.ax, label_limit=self.label_limit)
+        
+        # Heatmap of the density grid, shown instead of the markers in density view
+        self.heatmap = DensityRenderer(self.ax, self.density)
+        
+        # Rings and cluster colours for the Find searches
+        self.highlight = HighlightRenderer(self.ax)
         
         # Create canvas
         self.canvas = FigureCanvasTkAgg(self.fig, self.plot_container)
+        self.canvas.draw = self.perf.wrap('canvas.draw', self.canvas.draw)
+        
+        # Performance overlay, drawn over every full draw and drag frame when enabled
+        self.overlay = self.ax.text(0.01, 0.99, '', ha='left', va='top', family='monospace',
+                                    fontsize=8, zorder=10, animated=True, visible=False,
+                                    transform=self.ax.transAxes,
+                                    bbox=dict(boxstyle="round,pad=0.3", facecolor='white',
+                                              edgecolor='gray'))
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        
         self.canvas.draw()
+        self.loading_label.destroy()
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Bind mouse events
         self.canvas.mpl_connect('button_press_event', self.on_press)
         self.canvas.mpl_connect('button_release_event', self.on_release)
         self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.canvas.mpl_connect('resize_event', lambda event: self.redraw(idle=True))
         
         # Bind keyboard events
         self.root.bind('<Escape>', self.cancel_drag)
+        self.root.bind('<F3>', self.toggle_overlay)
+        self.root.bind('<Control-z>', self.undo)
+        self.root.bind('<Control-y>', self.redo)
+        self.root.bind('<Control-Z>', self.redo)  # Ctrl+Shift+Z
         
+    def get_quadrant_stats(self):
+        """Return {quadrant: {"count", "centroid", "spread"}} for the current roster"""
+        return self.stats.summary()
+    
+    def schedule_stats_refresh(self):
+        """Refresh the statistics panel once the current burst of edits is done"""
+        if self.stats_job is None:
+            self.stats_job = self.root.after_idle(self.refresh_stats_panel)
+    
+    def refresh_stats_panel(self):
+        self.stats_job = None
+        for quadrant, figures in self.stats.summary().items():
+            centroid = figures["centroid"]
+            spread = figures["spread"]
+            self.stats_tree.item(self.stats_items[quadrant], values=(
+                figures["count"],
+                f"{centroid[0]:.1f}, {centroid[1]:.1f}" if centroid else "-",
+                f"{spread[0]:.1f}, {spread[1]:.1f}" if spread else "-"))
+    
     def hide_folder(self, folder_path):
         """Hide the data folder based on the operating system"""
         try:
@@ -195,18 +409,36 @@ personality_compass_data/ folder"""
         except Exception as e:
             print(f"Could not hide folder: {e}")
     
-    def log_edit(self, action, details=None):
-        """Log an edit operation with timestamp"""
+    def log_edit(self, action, details=None, undo_delta=None):
+        """Log an edit operation with timestamp
+
+        Edits are also recorded for undo, as undo_delta if given or else as
+        derived from the entry. Entries logged while applying an undo or redo
+        are not recorded again. Edits that came from the sync server are
+        neither undoable here nor written (the server already has them).
+        """
         edit_entry = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
             "action": action,
             "details": details or {}
         }
-        self.edit_history.append(edit_entry)
+        self.session_edits.append(edit_entry)
+        self.edit_count += 1
         
-        # Keep only last 100 edits to prevent file from growing too large
-        if len(self.edit_history) > 100:
-            self.edit_history = self.edit_history[-100:]
+        # Keep the quadrant statistics (and any highlighted search) in step with the edit
+        if self.stats.apply(edit_entry):
+            self.schedule_stats_refresh()
+        if self.query is not None:
+            self.schedule_query_refresh()
+        
+        if not self.applying_undo and not self.applying_remote:
+            delta = undo_delta if undo_delta is not None else delta_from_entry(edit_entry)
+            if delta is not None:
+                self.undo_history.record(delta)
+        
+        # Append to the journal instead of re-saving the whole history (or send it to the sync server)
+        if not self.applying_remote:
+            self.writer.append_edit(edit_entry)
         
     def hide_folder(self, folder_path):
         """Hide the data folder based on the operating system"""
@@ -227,48 +459,376 @@ personality_compass_data/ folder"""
     
     def get_quadrant(self, x, y):
         """Determine which quadrant a point is in"""
-        if x >= 0 and y >= 0:
-            return "Gnatty NPC"
-        elif x < 0 and y >= 0:
-            return "Not NPC"
-        elif x < 0 and y < 0:
-            return "Not Non-NPC"
-        else:  # x >= 0 and y < 0
-            return "Gnatty Non-NPC"
+        return get_quadrant(x, y)
+    
+    def redraw(self, idle=False):
+        """Lay out name labels for the current view, then draw the canvas"""
+        self.renderer.layout_labels()
+        self.heatmap.update()
+        if idle:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.draw()
+    
+    def in_render_box(self, x, y):
+        x_min, x_max, y_min, y_max = self.render_box
+        return x_min <= x <= x_max and y_min <= y <= y_max
+    
+    def view_position(self, name):
+        """Where a person is plotted in the current view"""
+        return self.people.projections.position(self.view, self.people[name].row)
+    
+    def edit_axes(self):
+        """Axes that dragging and the X/Y fields change: the shown pair, or x and y under PCA"""
+        return self.view[1:] if self.view[0] == "axes" else COMPASS_VIEW[1:]
+    
+    def place_person(self, name):
+        """Add, move or drop a person's marker depending on whether they are near the view"""
+        person = self.people.get(name)
+        if person is not None:
+            x, y = self.view_position(name)
+        inside = person is not None and (self.in_render_box(x, y) or name == self.renderer.dragging)
+        if name in self.renderer.rows:
+            if inside:
+                self.renderer.move(name, x, y)
+            else:
+                self.renderer.remove(name)
+        elif inside:
+            self.renderer.add(name, x, y)
+    
+    def set_view(self, x_min, x_max, y_min, y_max):
+        """Show a region of the compass, keeping only nearby people in the renderer"""
+        full_x_min, full_x_max, full_y_min, full_y_max = self.full_view
+        
+        # Clamp the zoom level, then slide the view back inside the compass
+        x_span = max(self.min_span, min(full_x_max - full_x_min, x_max - x_min))
+        y_span = max(self.min_span, min(full_y_max - full_y_min, y_max - y_min))
+        x_min = max(full_x_min, min(full_x_max - x_span, (x_min + x_max - x_span) / 2))
+        y_min = max(full_y_min, min(full_y_max - y_span, (y_min + y_max - y_span) / 2))
+        view = (x_min, x_min + x_span, y_min, y_min + y_span)
+        if (self.ax.get_xlim(), self.ax.get_ylim()) == (view[:2], view[2:]):
+            return
+        self.ax.set_xlim(view[0], view[1])
+        self.ax.set_ylim(view[2], view[3])
+        
+        # Re-query the index when the view leaves the rendered region or is much smaller than it
+        box_x_min, box_x_max, box_y_min, box_y_max = self.render_box
+        outside = view[0] < box_x_min or view[1] > box_x_max or view[2] < box_y_min or view[3] > box_y_max
+        if outside or box_x_max - box_x_min > 6 * x_span or box_y_max - box_y_min > 6 * y_span:
+            # Keep a margin of half a view on each side so small pans need no re-query
+            self.render_box = (view[0] - x_span / 2, view[1] + x_span / 2,
+                               view[2] - y_span / 2, view[3] + y_span / 2)
+            self.renderer.replace(self.index.query_box(*self.render_box))
+            self.draw_highlight()
+        self.redraw(idle=True)
+    
+    def toggle_density_view(self):
+        """Switch between individual markers and the density heatmap"""
+        density = self.density_var.get()
+        self.heatmap.set_visible(density)
+        self.renderer.set_visible(not density)
+        self.redraw()
+    
+    def reset_view(self):
+        """Zoom back out to the whole compass"""
+        self.set_view(*self.full_view)
+    
+    def update_view_choices(self):
+        """Offer every pair of axes, then the PCA projection, in the View list"""
+        self.view_choices = [("axes", i, j) for i in range(len(self.axis_names))
+                             for j in range(i + 1, len(self.axis_names))] + [PCA_VIEW]
+        labels = []
+        for view in self.view_choices:
+            if view == COMPASS_VIEW:
+                labels.append("Compass")
+            elif view == PCA_VIEW:
+                labels.append("Principal components of all axes")
+            else:
+                labels.append(f"{self.axis_names[view[1]]}  /  {self.axis_names[view[2]]}")
+        self.view_box.config(values=labels)
+        self.view_box.current(self.view_choices.index(self.view))
+    
+    def show_view(self, view):
+        """Plot another pair of axes (or the PCA projection) of everyone's traits
+
+        Positions come from the store's projection cache, so returning to a
+        view, or switching after a few edits, does not refit the projection.
+        The density grid, index and markers are rebuilt for the new positions.
+        """
+        if self.dragging:
+            self.cancel_drag()
+        self.view = view
+        positions = self.people.projections.positions(view, refresh=True)
+        
+        # Axis titles; quadrant names only mean something on the compass axes
+        if view[0] == "axes":
+            self.ax.xaxis.label.set_text(self.axis_names[view[1]])
+            self.ax.yaxis.label.set_text(self.axis_names[view[2]])
+        else:
+            first, second = self.people.projections.explained
+            self.ax.xaxis.label.set_text(f"Principal component 1 ({first:.0%} of variance)")
+            self.ax.yaxis.label.set_text(f"Principal component 2 ({second:.0%} of variance)")
+        for label in self.quadrant_labels:
+            label.set_visible(view == COMPASS_VIEW)
+        
+        # Re-index and re-bin everyone at their positions in this view
+        self.index.clear()
+        for record, (x, y) in zip(self.people.records, positions.tolist()):
+            self.index.insert(record.name, x, y)
+        self.density.rebuild(positions)
+        
+        # Start the new view zoomed out
+        self.ax.set_xlim(self.full_view[0], self.full_view[1])
+        self.ax.set_ylim(self.full_view[2], self.full_view[3])
+        self.render_box = self.full_view
+        self.renderer.replace(self.index.query_box(*self.render_box))
+        self.update_view_choices()
+        if self.query is not None:
+            # Searches run on the plotted positions, so they are redone for this view
+            self.cluster_centres = None
+            self.refresh_query(draw=False)
+        self.redraw()
+    
+    def add_axis(self, name=None):
+        """Add a trait axis, with everyone at 0 on it, and offer it in the View list"""
+        if name is None:
+            name = simpledialog.askstring("Add Axis", "Name of the new axis (e.g. Introvert ← → Extrovert):",
+                                          parent=self.root)
+        if not name or not name.strip():
+            return
+        if self.sync is not None and not self.applying_remote:
+            # The server numbers shared axes; it is added here when the server sends it back
+            self.sync.send({"op": "axis", "name": name.strip()})
+            return
+        
+        axis = self.people.add_axis()
+        self.axis_names.append(name.strip())
+        self.log_edit("axis_added", {"axis": axis, "name": name.strip()})
+        self.update_view_choices()
+        if self.view == PCA_VIEW:
+            self.show_view(PCA_VIEW)  # The projection is refitted with the new axis
+        self.schedule_save()
+    
+    def run_query(self):
+        """Start the search picked in the Find row; it stays highlighted, and follows edits, until cleared"""
+        kind = self.query_kinds[self.query_box.current()][0]
+        try:
+            amount = float(self.query_amount_var.get())
+            if amount <= 0 or (kind in ("nearest", "kmeans") and amount != int(amount)):
+                raise ValueError
+        except ValueError:
+            if kind in ("nearest", "kmeans"):
+                messagebox.showerror("Error", "Please enter a whole number of at least 1.")
+            else:
+                messagebox.showerror("Error", "Please enter a distance greater than 0.")
+            return
+        
+        if kind in ("nearest", "within"):
+            name = self.people_list.selected_name()
+            if name not in self.people:
+                messagebox.showwarning("Warning", "Select someone in the People list to search around.")
+                return
+            self.query = (kind, name, amount)
+        else:
+            self.query = (kind, amount)
+        self.cluster_centres = None
+        self.refresh_query()
+    
+    def schedule_query_refresh(self):
+        """Re-run the highlighted search once the current burst of edits is done"""
+        if self.query_job is None:
+            self.query_job = self.root.after(self.query_delay_ms, self.refresh_query)
+    
+    def refresh_query(self, draw=True):
+        """Run the highlighted search against the current positions and show the result
+
+        Neighbour and radius searches go through the spatial index, which
+        every edit already keeps current. Clusters are computed from the
+        projection cache's position array in one vectorised pass; k-means
+        starts from its previous centres, so re-runs after edits are quick.
+        """
+        if self.query_job is not None:
+            self.root.after_cancel(self.query_job)
+            self.query_job = None
+        if self.query is None:
+            return
+        
+        kind = self.query[0]
+        if kind in ("nearest", "within"):
+            _, name, amount = self.query
+            if name not in self.people:
+                self.clear_query()  # The person searched around was removed
+                return
+            x, y = self.view_position(name)
+            if kind == "nearest":
+                found = self.index.k_nearest(x, y, int(amount), exclude={name})
+                summary = f"{len(found)} nearest to {name}"
+            else:
+                found = [(distance, other) for distance, other in self.index.within(x, y, amount) if other != name]
+                summary = f"{len(found)} within {amount:g} of {name}"
+            if found:
+                summary += ": " + ", ".join(f"{other} ({distance:.1f})" for distance, other in found[:5])
+                summary += ", ..." if len(found) > 5 else ""
+            positions = np.array([self.view_position(other) for _, other in found], dtype=float).reshape(-1, 2)
+            self.query_shown = (positions, None, (x, y), amount if kind == "within" else None)
+        else:
+            positions = self.people.projections.positions(self.view)
+            if kind == "kmeans":
+                labels, self.cluster_centres = kmeans(positions, int(self.query[1]), centres=self.cluster_centres)
+            else:
+                labels = dbscan(positions, self.query[1], self.cluster_min_samples)
+            sizes = sorted(np.bincount(labels[labels >= 0]).tolist(), reverse=True) if len(labels) else []
+            summary = f"{len(sizes)} clusters of " + ", ".join(str(size) for size in sizes[:8])
+            summary += ", ..." if len(sizes) > 8 else ""
+            summary += " people"
+            if kind == "dbscan":
+                summary += f"; {int((labels < 0).sum())} in no cluster"
+            self.query_shown = (positions.copy(), labels, None, None)
+        
+        self.query_var.set(summary)
+        self.draw_highlight()
+        if draw and not self.dragging:
+            self.redraw(idle=True)
+    
+    def draw_highlight(self):
+        """Show the last search result, keeping only the people near the view"""
+        if self.query_shown is None:
+            self.highlight.clear()
+            return
+        positions, labels, centre, radius = self.query_shown
+        x_min, x_max, y_min, y_max = self.render_box
+        near = ((positions[:, 0] >= x_min) & (positions[:, 0] <= x_max) &
+                (positions[:, 1] >= y_min) & (positions[:, 1] <= y_max))
+        if labels is None:
+            self.highlight.show_neighbours(positions[near], centre, radius)
+        else:
+            self.highlight.show_clusters(positions[near], labels[near])
+    
+    def clear_query(self):
+        """Stop highlighting the Find search"""
+        if self.query_job is not None:
+            self.root.after_cancel(self.query_job)
+            self.query_job = None
+        self.query = None
+        self.query_shown = None
+        self.cluster_centres = None
+        self.query_var.set("")
+        self.highlight.clear()
+        self.redraw(idle=True)
+    
+    def on_scroll(self, event):
+        """Zoom in or out, keeping the point under the cursor in place"""
+        if self.dragging or event.inaxes != self.ax:
+            return
+        factor = 1 / self.zoom_step if event.button == 'up' else self.zoom_step
+        x_min, x_max = self.ax.get_xlim()
+        y_min, y_max = self.ax.get_ylim()
+        self.set_view(event.xdata - (event.xdata - x_min) * factor,
+                      event.xdata + (x_max - event.xdata) * factor,
+                      event.ydata - (event.ydata - y_min) * factor,
+                      event.ydata + (y_max - event.ydata) * factor)
     
     def cancel_drag(self, event=None):
-        """Cancel current drag operation"""
+        """Cancel current drag operation, putting the person back where the drag began"""
+        was_dragging = self.dragging
         self.dragging = None
         self.drag_offset = (0, 0)
+        self.end_blit_drag()
+        if was_dragging:
+            self.update_person_position(was_dragging, *self.drag_start, self.edit_axes())
+            if self.sync is not None:
+                self.sync.send({"op": "drag_cancel", "name": was_dragging})
+    
+    def on_draw(self, event):
+        """After every full draw: cache the drag background, then add the overlay"""
+        if self.awaiting_first_paint:
+            self.awaiting_first_paint = False
+            first_paint = time.perf_counter() - LAUNCHED_AT
+            self.perf.record("startup.first_paint", first_paint)
+            print(f"Compass drawn {first_paint * 1000:.0f} ms after launch")
+        if self.dragging and self.renderer.dragging:
+            # Captured here so draws during a drag (e.g. a resize) refresh it too
+            self.drag_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_overlay()
+    
+    def draw_overlay(self):
+        if not self.overlay_visible:
+            return
+        
+        # Rendering the text costs more than a drag frame, so reuse it between refreshes
+        now = time.perf_counter()
+        if self.overlay_pixels is not None and now - self.overlay_drawn < self.overlay_interval:
+            self.canvas.restore_region(self.overlay_pixels)
+            return
+        
+        lines = [f"{self.perf.rate(('canvas.draw', 'draw_drag_frame')):6.1f} frames/s"]
+        for name in ('canvas.draw', 'draw_drag_frame', 'on_motion', 'update_listbox', 'save_data'):
+            mean = self.perf.mean(name)
+            if mean is not None:
+                lines.append(f"{name:<16}{mean * 1000:7.1f} ms  p95 {self.perf.percentile(name, 0.95) * 1000:7.1f} ms")
+        self.overlay.set_text("\n".join(lines))
+        self.fig.draw_artist(self.overlay)
+        self.overlay_pixels = self.canvas.copy_from_bbox(self.overlay.get_bbox_patch().get_window_extent().padded(2))
+        self.overlay_drawn = now
+    
+    def toggle_overlay(self, event=None):
+        """Show or hide the frame rate and latency overlay"""
+        self.overlay_visible = not self.overlay_visible
+        self.overlay.set_visible(self.overlay_visible)
+        self.overlay_pixels = None
+        self.redraw()
+    
+    def begin_blit_drag(self, name):
+        """Cache the static background so drag frames only redraw the dragged person"""
+        self.renderer.begin_drag(name)
+        self.redraw()  # on_draw caches the background
+        self.last_drag_frame = 0.0
+        self.draw_drag_frame()
+    
+    def draw_drag_frame(self):
+        """Restore the cached background and blit the dragged marker and label"""
+        self.drag_frame_pending = None
+        if not self.dragging or self.drag_background is None:
+            return
+        
+        self.renderer.move(self.dragging, *self.view_position(self.dragging))
+        
+        self.canvas.restore_region(self.drag_background)
+        self.renderer.draw_drag()
+        self.draw_overlay()
+        self.canvas.blit(self.fig.bbox)
+        self.last_drag_frame = time.perf_counter()
+    
+    def end_blit_drag(self):
+        """Drop the cached background and hand the dragged person back to the collection"""
+        if self.drag_frame_pending is not None:
+            self.root.after_cancel(self.drag_frame_pending)
+            self.drag_frame_pending = None
+        self.drag_background = None
+        self.renderer.end_drag()
         
     def delete_selected_person(self, event=None):
-        """Delete the selected person from the listbox"""
-        selection = self.people_listbox.curselection()
-        if selection:
-            selected_text = self.people_listbox.get(selection[0])
-            # Extract name from the listbox text (format: "Name (x, y) - Quadrant")
-            name = selected_text.split(' (')[0]
-            if name in self.people:
-                self.remove_person(name)
+        """Delete the selected person from the list"""
+        name = self.people_list.selected_name()
+        if name in self.people:
+            self.remove_person(name)
     
     def edit_coordinates(self, event=None):
         """Load coordinates of selected person into edit fields"""
-        selection = self.people_listbox.curselection()
-        if selection:
-            selected_text = self.people_listbox.get(selection[0])
-            name = selected_text.split(' (')[0]
-            if name in self.people:
-                person_data = self.people[name]
-                self.x_var.set(f"{person_data['x']:.1f}")
-                self.y_var.set(f"{person_data['y']:.1f}")
-                # Focus on X entry for immediate editing
-                self.x_entry.focus()
-                self.x_entry.select_range(0, tk.END)
+        name = self.people_list.selected_name()
+        if name in self.people:
+            traits = self.people[name].traits
+            x_axis, y_axis = self.edit_axes()
+            self.x_var.set(f"{traits[x_axis]:.1f}")
+            self.y_var.set(f"{traits[y_axis]:.1f}")
+            # Focus on X entry for immediate editing
+            self.x_entry.focus()
+            self.x_entry.select_range(0, tk.END)
     
     def update_coordinates(self):
         """Update the selected person's coordinates from the input fields"""
-        selection = self.people_listbox.curselection()
-        if not selection:
+        name = self.people_list.selected_name()
+        if name is None:
             messagebox.showwarning("Warning", "Please select a person from the list first.")
             return
         
@@ -281,36 +841,8 @@ personality_compass_data/ folder"""
             x = max(-100, min(100, x))
             y = max(-100, min(100, y))
             
-            # Get selected person
-            selected_text = self.people_listbox.get(selection[0])
-            name = selected_text.split(' (')[0]
-            
             if name in self.people:
-                # Store old position for logging
-                old_x = self.people[name]['x']
-                old_y = self.people[name]['y']
-                old_quadrant = self.people[name]['quadrant']
-                
-                # Update position
-                self.update_person_position(name, x, y)
-                
-                # Update quadrant
-                new_quadrant = self.get_quadrant(x, y)
-                self.people[name]['quadrant'] = new_quadrant
-                
-                # Log the coordinate edit
-                self.log_edit("coordinates_edited", {
-                    "name": name,
-                    "old_position": {"x": old_x, "y": old_y},
-                    "new_position": {"x": x, "y": y},
-                    "old_quadrant": old_quadrant,
-                    "new_quadrant": new_quadrant,
-                    "method": "manual_input"
-                })
-                
-                # Update display and save
-                self.update_listbox()
-                self.save_data()
+                self.set_person_position(name, x, y, "manual_input", self.edit_axes())
                 
                 # Update the input fields with constrained values
                 self.x_var.set(f"{x:.1f}")
@@ -319,16 +851,66 @@ personality_compass_data/ folder"""
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers for X and Y coordinates.\nX and Y must be between -100 and 100.")
     
+    def set_person_position(self, name, x, y, method, axes=(0, 1)):
+        """Set a person's values on two axes (x and y by default), reclassify them and log it"""
+        # Store old traits for logging
+        old_traits = self.people[name].traits
+        
+        # Update position and quadrant, then log the coordinate edit
+        self.update_person_position(name, x, y, axes)
+        self.log_move("coordinates_edited", name, axes, old_traits, method)
+        
+        # Update display and save
+        self.update_list_row(name)
+        self.mark_changed(name)
+    
+    def log_move(self, action, name, axes, old_traits, method=None):
+        """Reclassify a person moved along two axes and log the move
+
+        Moves along x and y are logged as action. Moves along any other axis
+        are logged as traits_edited, with the axes and the values on them.
+        Both carry the old and new compass position for the statistics.
+        """
+        old_quadrant, new_quadrant = self.people.reclassify(name)
+        person = self.people[name]
+        details = {
+            "name": name,
+            "old_position": {"x": old_traits[0], "y": old_traits[1]},
+            "new_position": {"x": person.x, "y": person.y},
+            "old_quadrant": old_quadrant,
+            "new_quadrant": new_quadrant
+        }
+        if tuple(axes) != (0, 1):
+            action = "traits_edited"
+            traits = person.traits
+            details["axes"] = list(axes)
+            details["axis_names"] = [self.axis_names[axis] for axis in axes]
+            details["old_values"] = [old_traits[axis] for axis in axes]
+            details["new_values"] = [traits[axis] for axis in axes]
+        if method:
+            details["method"] = method
+        self.log_edit(action, details)
+    
+    def person_details(self, person):
+        """x, y, quadrant and any further trait values, for batch history entries"""
+        details = {"x": person.x, "y": person.y, "quadrant": person.quadrant}
+        if self.people.dims > 2:
+            details["traits"] = person.traits[2:]
+        return details
+    
     def on_person_select(self, event=None):
-        """Handle person selection in listbox - populate coordinate fields"""
-        selection = self.people_listbox.curselection()
-        if selection:
-            selected_text = self.people_listbox.get(selection[0])
-            name = selected_text.split(' (')[0]
-            if name in self.people:
-                person_data = self.people[name]
-                self.x_var.set(f"{person_data['x']:.1f}")
-                self.y_var.set(f"{person_data['y']:.1f}")
+        """Handle person selection in the list - populate coordinate fields"""
+        name = self.people_list.selected_name()
+        if name in self.people:
+            traits = self.people[name].traits
+            x_axis, y_axis = self.edit_axes()
+            self.x_var.set(f"{traits[x_axis]:.1f}")
+            self.y_var.set(f"{traits[y_axis]:.1f}")
+        
+        # The selected person's name label is always shown
+        if name != self.renderer.selected and not self.dragging:
+            self.renderer.set_selected(name)
+            self.redraw()
         
     def add_person(self):
         name = self.name_var.get().strip()
@@ -341,97 +923,347 @@ personality_compass_data/ folder"""
             return
         
         # Add person at center (0, 0)
-        x, y = 0, 0
         date_added = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        quadrant = self.get_quadrant(x, y)
+        self.insert_person(name, 0, 0, date_added)
         
-        # Plot the point
-        scatter = self.ax.scatter([x], [y], s=100, c='red', alpha=0.7, 
-                                edgecolors='darkred', linewidth=2, zorder=5)
-        
-        # Add annotation with better positioning
-        annotation = self.ax.annotate(name, (x, y), xytext=(8, 8), 
-                                    textcoords='offset points', fontsize=9,
-                                    bbox=dict(boxstyle="round,pad=0.3", 
-                                            facecolor='white', alpha=0.9,
-                                            edgecolor='gray'),
-                                    zorder=6, ha='left', va='bottom')
+        # Clear input
+        self.name_var.set("")
+    
+    def insert_person(self, name, x, y, date_added, method=None, extra=None):
+        """Put one new person on the grid at (x, y), with extra as their further trait values, and log it"""
+        quadrant = self.get_quadrant(x, y)
         
         # Store the person data
-        self.people[name] = {
-            'x': x, 
-            'y': y, 
-            'scatter': scatter,
-            'annotation': annotation,
-            'date_added': date_added,
-            'quadrant': quadrant
-        }
+        self.people.add(name, x, y, date_added, quadrant, extra)
+        shown_x, shown_y = self.view_position(name)
+        self.density.add(shown_x, shown_y)
+        
+        # Plot the point (if it is near the view) and index it
+        self.place_person(name)
+        self.index.insert(name, shown_x, shown_y)
         
         # Log the addition
-        self.log_edit("person_added", {
+        details = {
             "name": name,
             "position": {"x": x, "y": y},
-            "quadrant": quadrant
-        })
-        
-        # Update listbox
-        self.people_listbox.insert(tk.END, f"{name} ({x:.0f}, {y:.0f})")
+            "quadrant": quadrant,
+            "date_added": date_added
+        }
+        if self.people.dims > 2:
+            details["traits"] = self.people[name].traits[2:]
+        if method:
+            details["method"] = method
+        self.log_edit("person_added", details)
         
-        # Clear input
-        self.name_var.set("")
+        # Add the list row
+        self.insert_list_row(name)
         
         # Refresh canvas
-        self.canvas.draw()
-        
-        # Save data after position update
-        self.save_data()
+        self.redraw()
         
         # Save data after adding person
-        self.save_data()
+        self.mark_changed(name)
+        
+    def import_people(self, path=None):
+        """Add everyone from a CSV or JSON file in one batch
+
+        The whole file is stored, classified and plotted at once, and produces
+        a single history entry, one redraw and one save.
+        """
+        if path is None:
+            path = filedialog.askopenfilename(title="Import People",
+                                              filetypes=[("CSV or JSON", "*.csv *.json"), ("All files", "*.*")])
+        if not path:
+            return
+        
+        try:
+            names, xy = read_people_file(path, self.axis_names[2:])
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not read {path}:\n{e}")
+            return
+        
+        # Skip people already on the grid and repeats within the file
+        seen = set()
+        keep = []
+        for i, name in enumerate(names):
+            if name not in self.people and name not in seen:
+                seen.add(name)
+                keep.append(i)
+        skipped = len(names) - len(keep)
+        names = [names[i] for i in keep]
+        xy = xy[keep].clip(-100, 100)
+        if not names:
+            messagebox.showinfo("Import", f"No new people found in {os.path.basename(path)}.")
+            return
+        
+        date_added = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        added = self.add_people(names, xy, date_added, "people_imported", {"source": os.path.basename(path)})
+        
+        message = f"Imported {len(added)} people."
+        if skipped:
+            message += f"\nSkipped {skipped} already on the grid or repeated."
+        messagebox.showinfo("Import", message)
+    
+    def add_people(self, names, xy, date_added, action, details):
+        """Add a batch of new people with one history entry, one redraw and one save"""
+        # Store and classify the whole batch at once
+        added = self.people.add_arrays(names, xy, date_added)
+        shown = self.people.projections.positions(self.view)[len(self.people) - len(added):].tolist()
+        self.density.add_many(shown)
+        
+        # Log one entry for the whole batch
+        self.log_edit(action, dict(details, people_count=len(added), people={
+            person.name: self.person_details(person) for person in added
+        }))
+        
+        # Plot the people near the view, then index and list the batch
+        self.renderer.add_many((person.name, x, y) for person, (x, y) in zip(added, shown)
+                               if self.in_render_box(x, y))
+        for person, (x, y) in zip(added, shown):
+            self.index.insert(person.name, x, y)
+            self.insert_list_row(person.name)
+        self.redraw()
+        
+        # One save for the whole batch
+        self.removed_people.difference_update(names)
+        self.changed_people.update(names)
+        self.schedule_save()
+        return added
+    
+    def remove_people(self, names, method):
+        """Remove a batch of people with one history entry, one redraw and one save"""
+        names = [name for name in names if name in self.people]
+        if self.dragging in names:
+            self.cancel_drag()
+        self.log_edit("people_removed", {
+            "method": method,
+            "people_count": len(names),
+            "people": {name: self.person_details(self.people[name]) for name in names}
+        })
+        
+        # One pass per structure, so removing a large batch stays linear
+        self.density.remove_many([self.view_position(name) for name in names])
+        self.renderer.remove_many(names)
+        self.index.remove_many(names)
+        self.people_list.delete_many(names)
+        for name in names:
+            self.people.remove(name)
+        self.redraw()
+        
+        self.changed_people.difference_update(names)
+        self.removed_people.update(names)
+        self.schedule_save()
+    
+    def export_people(self, path=None):
+        """Write everyone to a CSV or JSON file (chosen by extension)"""
+        if path is None:
+            path = filedialog.asksaveasfilename(title="Export People", defaultextension=".csv",
+                                                filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        
+        try:
+            count = write_people_file(path, self.people, self.axis_names[2:])
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not write {path}:\n{e}")
+            return
+        messagebox.showinfo("Export", f"Exported {count} people to {os.path.basename(path)}.")
         
     def clear_all(self):
         if messagebox.askyesno("Confirm", "Clear all people from the grid?"):
-            # Log the clear operation before clearing
-            people_cleared = list(self.people.keys())
-            self.log_edit("all_people_cleared", {
-                "people_count": len(people_cleared),
-                "people_names": people_cleared
-            })
-            
-            # Clear plot
-            for person_data in self.people.values():
-                person_data['scatter'].remove()
-                person_data['annotation'].remove()
-            
-            # Clear data
-            self.people.clear()
-            
-            # Clear listbox
-            self.people_listbox.delete(0, tk.END)
-            
-            # Refresh canvas
-            self.canvas.draw()
-            
-            # Save data after removing person
-            self.save_data()
-            
-            # Save data after clearing
-            self.save_data()
+            self.clear_people()
+    
+    def clear_people(self, method=None):
+        """Remove everyone; undo keeps their names, positions and dates as compact arrays"""
+        if self.dragging:
+            self.cancel_drag()
+        
+        # Log the clear operation before clearing
+        people_cleared = self.people.names()
+        details = {
+            "people_count": len(people_cleared),
+            "people_names": people_cleared
+        }
+        if method:
+            details["method"] = method
+        records = self.people.records
+        self.log_edit("all_people_cleared", details, undo_delta=(
+            "clear", [record.name for record in records], self.people.vectors.copy(),
+            [record.date_added for record in records]))
+        
+        # Clear plot
+        self.renderer.clear()
+        self.index.clear()
+        self.density.clear()
+        
+        # Clear data
+        self.cancel_loading()
+        self.people.clear()
+        
+        # Clear list
+        self.people_list.clear()
+        
+        # Refresh canvas
+        self.redraw()
+        
+        # Save data after clearing
+        self.mark_cleared()
+    
+    def undo(self, event=None):
+        """Undo the most recent edit"""
+        self.apply_delta(self.undo_history.pop_undo(), "undo")
+    
+    def redo(self, event=None):
+        """Redo the most recently undone edit"""
+        self.apply_delta(self.undo_history.pop_redo(), "redo")
+    
+    def apply_delta(self, delta, method):
+        """Apply an undo/redo delta through the normal edit paths, without recording it again
+
+        Other windows sharing the roster can add, move or remove people
+        after a step was recorded here, so people already added (or already
+        gone) are skipped rather than applied twice.
+        """
+        if delta is None:
+            return
+        if self.dragging:
+            self.cancel_drag()
+        
+        self.applying_undo = True
+        try:
+            kind = delta[0]
+            if kind == "add" and delta[1] in self.people:
+                return  # Added again in another window since
+            if kind in ("remove", "move", "traits") and delta[1] not in self.people:
+                return  # Removed in another window since
+            if kind == "add":
+                name, x, y, date_added, extra = delta[1:]
+                self.insert_person(name, x, y, date_added, method, extra)
+            elif kind == "remove":
+                self.remove_person(delta[1], method)
+            elif kind == "move":
+                name, _, _, x, y = delta[1:]
+                self.set_person_position(name, x, y, method)
+            elif kind == "traits":
+                name, axes, _, values = delta[1:]
+                self.set_person_position(name, *values, method, axes)
+            elif kind == "add_many":
+                names, xy, dates = delta[1:]
+                new = [i for i, name in enumerate(names) if name not in self.people]
+                if len(new) < len(names):
+                    names = [names[i] for i in new]
+                    xy = xy[new]
+                    dates = dates if isinstance(dates, str) else [dates[i] for i in new]
+                if names:
+                    self.add_people(names, xy, dates, "people_restored", {"method": method})
+            elif kind == "remove_many":
+                self.remove_people(delta[1], method)
+            elif kind == "clear":
+                self.clear_people(method)
+        except Exception as e:
+            print(f"Error applying {method}: {e}")
+        finally:
+            self.applying_undo = False
+    
+    def poll_sync(self):
+        """Apply everything the sync server has sent since the last poll"""
+        messages = self.sync.receive()
+        for message in messages:
+            self.apply_remote(message)
+        if any(message.get("op") in ("drags", "drag_cancel") for message in messages):
+            self.redraw(idle=True)  # Live drags from other windows share one draw per poll
+        self.sync_job = self.root.after(self.sync_poll_ms, self.poll_sync)
+    
+    def apply_remote(self, message):
+        """Apply a delta from the sync server through the normal edit paths, without sending it back
+
+        The server echoes this window's own edits too, in its order, so
+        deltas that are already true here are skipped. People dragged in
+        another window are put back where the drag began before a committed
+        edit lands on them, so the history and statistics see the real move.
+        """
+        op = message.get("op")
+        if op == "drags":
+            for name, axes, values in message["moves"]:
+                if name in self.people and name != self.dragging:
+                    self.remote_drags.setdefault(name, (axes, [self.people[name].traits[axis] for axis in axes]))
+                    self.update_person_position(name, *values, axes, draw=False)
+            return
+        if op == "disconnected":
+            messagebox.showwarning("Sync", f"Lost the connection to the sync server ({message['reason']}).\n"
+                                           "Edits made from now on are not shared or saved.")
+            return
+        
+        names = message.get("names") or list(message.get("people", ())) or [message.get("name")]
+        for name in names:
+            self.restore_remote_drag(name)
+        if op == "drag_cancel" or (self.dragging in names and op in ("add", "move", "traits")):
+            return  # This window's own drag is sent when it ends
+        
+        self.applying_remote = True
+        try:
+            if op == "add":
+                values = [message["x"], message["y"]] + message["traits"]
+                self.sync_person(message["name"], [message["date"]] + values)
+            elif op == "move":
+                name = message["name"]
+                if name in self.people and self.people[name].traits[:2] != [message["x"], message["y"]]:
+                    self.set_person_position(name, message["x"], message["y"], "sync")
+            elif op == "traits":
+                name, axes, values = message["name"], message["axes"], message["values"]
+                if name in self.people and [self.people[name].traits[axis] for axis in axes] != values:
+                    self.set_person_position(name, *values, "sync", axes)
+            elif op == "remove":
+                self.remove_person(message["name"], "sync")
+            elif op == "add_many":
+                rows = [(name, xy) for name, xy in zip(message["names"], message["xy"]) if name not in self.people]
+                if rows:
+                    self.add_people([name for name, _ in rows], [xy for _, xy in rows], message["date"],
+                                    "people_imported", {"method": "sync"})
+            elif op == "remove_many":
+                if any(name in self.people for name in names):
+                    self.remove_people(names, "sync")
+            elif op == "clear":
+                self.remote_drags.clear()
+                if len(self.people):
+                    self.clear_people("sync")
+            elif op == "axis":
+                if self.people.dims <= message["axis"]:
+                    self.add_axis(message["name"])
+            elif op == "fix":
+                for name, state in message["people"].items():
+                    self.sync_person(name, state)
+        except Exception as e:
+            print(f"Error applying sync message {op}: {e}")
+        finally:
+            self.applying_remote = False
+    
+    def sync_person(self, name, state):
+        """Make one person match the server; state is [date_added, x, y, *traits], or None if they are gone"""
+        if name in self.people:
+            traits = self.people[name].traits
+            if state is not None and traits == (state[1:] + [0.0] * len(traits))[:len(traits)]:
+                return
+            self.remove_person(name, "sync")
+        if state is not None:
+            self.insert_person(name, state[1], state[2], state[0], "sync", state[3:])
+    
+    def restore_remote_drag(self, name):
+        """Put someone dragged in another window back where that drag began, without logging it"""
+        start = self.remote_drags.pop(name, None)
+        if start is not None and name in self.people:
+            axes, values = start
+            self.update_person_position(name, *values, axes, draw=False)
     
     def find_person_at_point(self, event):
+        """Return the person closest to the click, within hit_radius pixels"""
         if event.inaxes != self.ax:
             return None
-            
-        for name, data in self.people.items():
-            # Check if click is near the person's position
-            dx = abs(event.xdata - data['x'])
-            dy = abs(event.ydata - data['y'])
-            
-            # Adjust sensitivity based on plot scale
-            sensitivity = 5
-            if dx < sensitivity and dy < sensitivity:
-                return name
-        return None
+        
+        # Pixels per data unit, so the search radius is measured on screen
+        (x0, y0), (x1, y1) = self.ax.transData.transform([(0, 0), (1, 1)])
+        return self.index.nearest(event.xdata, event.ydata, self.hit_radius,
+                                  scale_x=abs(x1 - x0), scale_y=abs(y1 - y0))
     
     def on_press(self, event):
         if event.inaxes != self.ax:
@@ -442,12 +1274,24 @@ personality_compass_data/ folder"""
         if event.button == 3:  # Right click - remove person
             if person:
                 self.remove_person(person)
-        elif event.button == 1 and person:  # Left click - start drag
+        elif event.button == 1 and person and self.view[0] == "axes":  # Left click - start drag
             self.dragging = person
-            self.drag_offset = (event.xdata - self.people[person]['x'], 
-                              event.ydata - self.people[person]['y'])
+            self.drag_start = self.view_position(person)
+            self.drag_offset = (event.xdata - self.drag_start[0], 
+                              event.ydata - self.drag_start[1])
+            self.begin_blit_drag(person)
+        elif event.button in (1, 2):  # Drag on empty space (or middle-drag) - pan the view
+            self.panning = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
     
     def on_motion(self, event):
+        if self.panning and event.x is not None:
+            # Move the view by the mouse travel, converted from pixels to compass units
+            start_x, start_y, (x_min, x_max), (y_min, y_max) = self.panning
+            dx = (event.x - start_x) * (x_max - x_min) / self.ax.bbox.width
+            dy = (event.y - start_y) * (y_max - y_min) / self.ax.bbox.height
+            self.set_view(x_min - dx, x_max - dx, y_min - dy, y_max - dy)
+            return
+        
         if self.dragging and event.inaxes == self.ax:
             # Calculate new position
             new_x = event.xdata - self.drag_offset[0]
@@ -457,173 +1301,237 @@ personality_compass_data/ folder"""
             new_x = max(-100, min(100, new_x))
             new_y = max(-100, min(100, new_y))
             
-            # Update position
-            self.update_person_position(self.dragging, new_x, new_y)
+            # Store the position now, but only render at the display frame rate
+            self.density.move(*self.view_position(self.dragging), new_x, new_y)
+            self.people.set_traits(self.dragging, self.view[1:], (new_x, new_y))
+            self.index.move(self.dragging, new_x, new_y)
+            if self.sync is not None:
+                self.sync.send_drag(self.dragging, self.view[1:], (new_x, new_y))
+            
+            if self.drag_frame_pending is None:
+                wait = self.frame_interval - (time.perf_counter() - self.last_drag_frame)
+                if wait <= 0:
+                    self.draw_drag_frame()
+                else:
+                    self.drag_frame_pending = self.root.after(int(wait * 1000) + 1, self.draw_drag_frame)
     
     def on_release(self, event):
+        self.panning = None
         if self.dragging:
-            # Update quadrant when drag is finished
-            person_data = self.people[self.dragging]
-            old_quadrant = person_data['quadrant']
-            new_quadrant = self.get_quadrant(person_data['x'], person_data['y'])
-            person_data['quadrant'] = new_quadrant
+            # Put the final position back into the collection and do one full draw
+            self.end_blit_drag()
+            self.renderer.move(self.dragging, *self.view_position(self.dragging))
+            self.redraw()
             
-            # Log the position change
-            self.log_edit("person_moved", {
-                "name": self.dragging,
-                "new_position": {"x": person_data['x'], "y": person_data['y']},
-                "old_quadrant": old_quadrant,
-                "new_quadrant": new_quadrant
-            })
+            # Update quadrant and log the position change now the drag is finished
+            old_traits = self.people[self.dragging].traits
+            for axis, value in zip(self.view[1:], self.drag_start):
+                old_traits[axis] = value
+            self.log_move("person_moved", self.dragging, self.view[1:], old_traits)
             
-            self.update_listbox()
+            self.update_list_row(self.dragging)
+            self.mark_changed(self.dragging)
             
         self.dragging = None
         self.drag_offset = (0, 0)
     
-    def update_person_position(self, name, x, y):
+    def update_person_position(self, name, x, y, axes=(0, 1), draw=True):
+        """Set a person's values on two axes (x and y by default) and move their marker"""
         if name not in self.people:
             return
             
         # Update stored position
-        self.people[name]['x'] = x
-        self.people[name]['y'] = y
-        
-        # Update scatter plot
-        self.people[name]['scatter'].set_offsets([[x, y]])
+        old_x, old_y = self.view_position(name)
+        self.people.set_traits(name, axes, (x, y))
+        shown_x, shown_y = self.view_position(name)
+        self.density.move(old_x, old_y, shown_x, shown_y)
         
-        # Update annotation
-        self.people[name]['annotation'].set_position((x, y))
+        # Update the marker in place (or add/drop it as it enters/leaves the view)
+        self.place_person(name)
+        self.index.move(name, shown_x, shown_y)
         
-        # Update listbox
-        self.update_listbox()
+        # Update the list row
+        self.update_list_row(name)
         
         # Refresh canvas
-        self.canvas.draw()
+        if draw:
+            self.redraw()
     
-    def remove_person(self, name):
+    def remove_person(self, name, method=None):
+        if name == self.dragging:
+            self.cancel_drag()
+        
         if name in self.people:
             # Log the removal before removing
-            person_data = self.people[name]
-            self.log_edit("person_removed", {
+            person = self.people[name]
+            details = {
                 "name": name,
-                "position": {"x": person_data['x'], "y": person_data['y']},
-                "quadrant": person_data['quadrant'],
-                "date_added": person_data['date_added']
-            })
+                "position": {"x": person.x, "y": person.y},
+                "quadrant": person.quadrant,
+                "date_added": person.date_added
+            }
+            if self.people.dims > 2:
+                details["traits"] = person.traits[2:]
+            if method:
+                details["method"] = method
+            self.log_edit("person_removed", details)
             
             # Remove from plot
-            self.people[name]['scatter'].remove()
-            self.people[name]['annotation'].remove()
+            self.density.remove(*self.view_position(name))
+            self.renderer.remove(name)
+            self.index.remove(name)
             
             # Remove from data
-            del self.people[name]
+            self.people.remove(name)
             
-            # Update listbox
-            self.update_listbox()
+            # Remove the list row
+            self.delete_list_row(name)
             
             # Refresh canvas
-            self.canvas.draw()
+            self.redraw()
             
             # Save data after removing person
-            self.save_data()
+            self.mark_removed(name)
+    
+    def insert_list_row(self, name):
+        person = self.people[name]
+        self.people_list.insert(name, person.x, person.y, person.quadrant)
+    
+    def update_list_row(self, name):
+        """Refresh a single row in place instead of rebuilding the list"""
+        person = self.people[name]
+        self.people_list.update(name, person.x, person.y, person.quadrant)
+    
+    def delete_list_row(self, name):
+        self.people_list.delete(name)
     
     def update_listbox(self):
-        self.people_listbox.delete(0, tk.END)
-        for name, data in self.people.items():
-            self.people_listbox.insert(tk.END, f"{name} ({data['x']:.0f}, {data['y']:.0f}) - {data['quadrant']}")
+        """Rebuild the whole People list (only needed after a full load)"""
+        self.people_list.rebuild((name, person.x, person.y, person.quadrant)
+                                 for name, person in self.people.items())
+    
+    def mark_changed(self, name):
+        """Record that a person was added or moved, and schedule a save"""
+        self.removed_people.discard(name)
+        self.changed_people.add(name)
+        self.schedule_save()
+    
+    def mark_removed(self, name):
+        self.changed_people.discard(name)
+        self.removed_people.add(name)
+        self.schedule_save()
+    
+    def mark_cleared(self):
+        self.changed_people.clear()
+        self.removed_people.clear()
+        self.people_cleared = True
+        self.schedule_save()
+    
+    def schedule_save(self):
+        """Mark the data dirty and write it once the save window has passed"""
+        self.dirty = True
+        if self.save_pending is None:
+            self.save_pending = self.root.after(self.save_delay_ms, self.flush_save)
+    
+    def flush_save(self, force=False):
+        """Write pending changes now (force writes even if nothing changed)"""
+        if self.save_pending is not None:
+            self.root.after_cancel(self.save_pending)
+            self.save_pending = None
+        if self.dirty or force:
+            self.dirty = False
+            self.save_data()
     
     def save_data(self):
-        """Save people data to JSON file with enhanced information and edit history"""
+        """Queue a save of the people state for the background writer
+
+        The edit history is written separately as it happens, so a save only
+        holds metadata and people. Full-snapshot storage gets everyone;
+        row-level storage only gets the people changed since the last save.
+        """
         try:
-            # Extract all data including metadata
-            save_data = {
-                "metadata": {
-                    "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
-                    "total_people": len(self.people),
-                    "version": "2.1",
-                    "total_edits": len(self.edit_history),
-                    "session_started": getattr(self, 'session_start', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-                },
-                "edit_history": self.edit_history,
-                "people": {}
+            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            metadata = {
+                "last_updated": now,
+                "total_people": len(self.people),
+                "version": "2.2",
+                "total_edits": self.edit_count,
+                "session_started": getattr(self, 'session_start', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
             }
+            if self.people.dims > 2:
+                metadata["axes"] = list(self.axis_names)
+            
+            if self.storage.full_snapshots:
+                names = self.people.names()
+            else:
+                names = [name for name in self.changed_people if name in self.people]
             
-            for name, data in self.people.items():
-                save_data["people"][name] = {
-                    'x': float(data['x']),
-                    'y': float(data['y']),
-                    'quadrant': data['quadrant'],
-                    'date_added': data['date_added'],
-                    'last_moved': datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            people = {}
+            for name in names:
+                person = self.people[name]
+                people[name] = {
+                    'x': person.x,
+                    'y': person.y,
+                    'quadrant': person.quadrant,
+                    'date_added': person.date_added,
+                    'last_moved': now
                 }
+                if self.people.dims > 2:
+                    people[name]['traits'] = person.traits[2:]
             
-            with open(self.data_file, 'w') as f:
-                json.dump(save_data, f, indent=2)
+            # The save is never modified again, so the writer thread can own it
+            self.writer.submit(metadata, people, deleted=list(self.removed_people), cleared=self.people_cleared)
+            self.changed_people.clear()
+            self.removed_people.clear()
+            self.people_cleared = False
                 
         except Exception as e:
             print(f"Error saving data: {e}")
     
     def load_data(self):
-        """Load people data from JSON file"""
+        """Load people data and edit history from storage"""
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    loaded_data = json.load(f)
+            loaded = self.storage.load()
+            if loaded is not None:
+                metadata, people_data = loaded
                 
-                # Load edit history if available
-                self.edit_history = loaded_data.get("edit_history", [])
+                # The edit history is left on disk until it is viewed
+                self.edit_count = metadata.get("total_edits", 0)
+                if self.storage.needs_resave:
+                    # Rewrite the snapshot without the embedded history
+                    self.schedule_save()
                 
                 # Log the session start
                 if not hasattr(self, 'session_start'):
                     self.session_start = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     self.log_edit("session_started", {
-                        "previous_total_people": loaded_data.get("metadata", {}).get("total_people", 0),
-                        "previous_last_updated": loaded_data.get("metadata", {}).get("last_updated", "Unknown")
+                        "previous_total_people": metadata.get("total_people", 0),
+                        "previous_last_updated": metadata.get("last_updated", "Unknown")
                     })
                 
-                # Handle both old and new data formats
-                if "people" in loaded_data:
-                    people_data = loaded_data["people"]
-                else:
-                    people_data = loaded_data  # Old format
+                # Trait axes beyond x and y, if any were added
+                axes = metadata.get("axes") or []
+                if len(axes) > len(self.axis_names):
+                    self.axis_names.extend(axes[len(self.axis_names):])
+                while self.people.dims < len(self.axis_names):
+                    self.people.add_axis()
+                self.update_view_choices()
                 
-                # Add each person back to the plot
-                for name, pos_data in people_data.items():
-                    x, y = pos_data['x'], pos_data['y']
-                    
-                    # Get additional data if available
-                    date_added = pos_data.get('date_added', 'Unknown')
-                    quadrant = pos_data.get('quadrant', self.get_quadrant(x, y))
-                    
-                    # Plot the point
-                    scatter = self.ax.scatter([x], [y], s=100, c='red', alpha=0.7, 
-                                            edgecolors='darkred', linewidth=2, zorder=5)
-                    
-                    # Add annotation with better positioning
-                    annotation = self.ax.annotate(name, (x, y), xytext=(8, 8), 
-                                                textcoords='offset points', fontsize=9,
-                                                bbox=dict(boxstyle="round,pad=0.3", 
-                                                        facecolor='white', alpha=0.9,
-                                                        edgecolor='gray'),
-                                                zorder=6, ha='left', va='bottom')
-                    
-                    # Store the person data
-                    self.people[name] = {
-                        'x': x, 
-                        'y': y, 
-                        'scatter': scatter,
-                        'annotation': annotation,
-                        'date_added': date_added,
-                        'quadrant': quadrant
-                    }
+                # Store everyone at once; unknown quadrant names are recomputed
+                self.people.add_many(((name, pos_data['x'], pos_data['y'],
+                                       pos_data.get('date_added', 'Unknown'), pos_data.get('quadrant'))
+                                      for name, pos_data in people_data.items()),
+                                     (pos_data.get('traits') for pos_data in people_data.values()))
+                self.density.rebuild(self.people.projections.positions(self.view))
+                self.stats.add_many(self.people.coords, self.people.codes)
+                self.schedule_stats_refresh()
                 
-                # Update listbox and canvas
-                self.update_listbox()
-                self.canvas.draw()
+                # Draw the first batch now and stream the rest in while the UI runs
+                self.pending_load = list(self.people)
+                self.load_next_batch()
                 
-                print(f"Loaded {len(people_data)} people from saved data")
-                print(f"Edit history contains {len(self.edit_history)} entries")
+                print(f"Loaded {len(people_data)} people from {self.storage.describe()}")
+                print(f"Edit history contains {self.edit_count} entries")
                 
         except Exception as e:
             print(f"Error loading data: {e}")
@@ -631,18 +1539,107 @@ personality_compass_data/ folder"""
             if not hasattr(self, 'session_start'):
                 self.session_start = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
+    def load_next_batch(self):
+        """Plot, index and list the next batch of loaded people"""
+        self.load_job = None
+        batch = self.pending_load[:self.load_batch_size]
+        del self.pending_load[:self.load_batch_size]
+        
+        # People removed or cleared while loading are skipped; moved ones use their new position
+        batch = [(name, *self.view_position(name)) for name in batch if name in self.people]
+        self.renderer.add_many((name, x, y) for name, x, y in batch if self.in_render_box(x, y))
+        for name, x, y in batch:
+            self.index.insert(name, x, y)
+            self.insert_list_row(name)
+        
+        if not self.dragging:
+            self.redraw(idle=True)
+        if self.pending_load:
+            self.load_job = self.root.after(1, self.load_next_batch)
+    
+    def cancel_loading(self):
+        if self.load_job is not None:
+            self.root.after_cancel(self.load_job)
+            self.load_job = None
+        self.pending_load = []
+    
+    def get_edit_history(self):
+        """Return the full edit history, reading earlier sessions from disk on first use"""
+        if self.edit_history is None:
+            self.edit_history = self.storage.load_history()
+        return self.edit_history + self.session_edits
+    
+    def show_history(self):
+        """Open a window listing the most recent edits"""
+        history = self.get_edit_history()
+        limit = 1000
+        
+        window = tk.Toplevel(self.root)
+        window.title("Edit History")
+        window.geometry("600x400")
+        
+        ttk.Label(window, text=f"Showing the last {min(limit, len(history))} of {len(history)} edits",
+                  padding="5").pack(fill=tk.X)
+        
+        container = ttk.Frame(window, padding="5")
+        container.pack(fill=tk.BOTH, expand=True)
+        scrollbar = ttk.Scrollbar(container)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree = ttk.Treeview(container, columns=('action', 'name'), yscrollcommand=scrollbar.set)
+        tree.heading('#0', text='Time')
+        tree.heading('action', text='Action')
+        tree.heading('name', text='Name')
+        tree.column('#0', width=180)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=tree.yview)
+        
+        # Newest first
+        for entry in reversed(history[-limit:]):
+            tree.insert('', tk.END, text=entry.get('timestamp', ''),
+                        values=(entry.get('action', ''), entry.get('details', {}).get('name', '')))
+    
+    def show_replay(self):
+        """Open a window that replays the edit history on a timeline scrubber"""
+        ReplayWindow(self.root, self.get_edit_history(), density=self.density_var.get(),
+                     label_limit=self.label_limit)
+    
     def on_closing(self):
         """Handle window closing - ensure data is saved"""
         self.log_edit("session_ended", {
             "final_people_count": len(self.people),
             "session_duration_seconds": (datetime.now() - datetime.strptime(self.session_start, "%Y-%m-%d %H:%M:%S")).total_seconds() if hasattr(self, 'session_start') else 0
         })
-        self.save_data()
+        if self.started:  # Never save over the data file before it was loaded
+            self.flush_save(force=True)
+        self.writer.close()
+        self.save_perf_stats()
         self.root.destroy()
+    
+    def save_perf_stats(self):
+        """Write this session's hot-path timings next to the data files"""
+        try:
+            write_json_atomic(os.path.join(self.data_dir, "performance_stats.json"), {
+                "session_started": getattr(self, 'session_start', None),
+                "session_ended": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "people": len(self.people),
+                "timings": self.perf.summary()
+            })
+        except Exception as e:
+            print(f"Error saving performance stats: {e}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Personality Compass")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="store people and edit history in SQLite (migrates existing JSON data)")
+    parser.add_argument("--label-limit", type=int, default=1000,
+                        help="with more people than this in view, only label selected and recently moved people")
+    parser.add_argument("--sync", nargs="?", const=DEFAULT_ADDRESS, metavar="HOST:PORT",
+                        help=f"share the roster through a running syncServer.py (default: {DEFAULT_ADDRESS})")
+    args = parser.parse_args()
+    
     root = tk.Tk()
-    app = PersonalityCompass(root)
+    backend = "sync" if args.sync else "sqlite" if args.sqlite else "json"
+    app = PersonalityCompass(root, backend=backend, label_limit=args.label_limit, sync_address=args.sync)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+import bisect
+import itertools
+import tkinter as tk
+
+
+class PeopleListView:
+    """Sorted, filterable People table backed by name <-> Treeview item maps
+
+    Only rows matching the current filter exist as Treeview items, and each
+    edit touches a single row, so selection lookups are a dict access and
+    list maintenance does not grow with the size of the roster.
+    """
+
+    COLUMNS = ('x', 'y', 'quadrant')
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.rows = {}  # {name: (x, y, quadrant)} for every person
+        self.added = {}  # {name: insertion sequence number}, the default order
+        self.items = {}  # {name: Treeview item id} for rows currently shown
+        self.names = {}  # {Treeview item id: name}
+        self.visible = []  # Ascending [(sort_key, name)] of rows currently shown
+        self.sort_column = None  # None keeps insertion order
+        self.descending = False
+        self.filter_text = ''
+        self.counter = itertools.count()
+
+        self.tree.heading('#0', command=lambda: self.sort_by('#0'))
+        for column in self.COLUMNS:
+            self.tree.heading(column, command=lambda c=column: self.sort_by(c))
+
+    def sort_key(self, name):
+        x, y, quadrant = self.rows[name]
+        if self.sort_column == '#0':
+            return (name.lower(), name)
+        if self.sort_column == 'x':
+            return (x, name)
+        if self.sort_column == 'y':
+            return (y, name)
+        if self.sort_column == 'quadrant':
+            return (quadrant, name)
+        return (self.added[name], name)
+
+    def matches(self, name):
+        return self.filter_text in name.lower()
+
+    def tree_index(self, position):
+        """Map a position in the ascending list to a Treeview index"""
+        if self.descending:
+            return len(self.visible) - 1 - position
+        return position
+
+    def _show(self, name):
+        key = self.sort_key(name)
+        position = bisect.bisect_left(self.visible, key)
+        self.visible.insert(position, key)
+        x, y, quadrant = self.rows[name]
+        item = self.tree.insert('', self.tree_index(position), text=name,
+                                values=(f"{x:.0f}", f"{y:.0f}", quadrant))
+        self.items[name] = item
+        self.names[item] = name
+
+    def _hide(self, name):
+        item = self.items.pop(name, None)
+        if item is None:
+            return
+        del self.names[item]
+        position = bisect.bisect_left(self.visible, self.sort_key(name))
+        del self.visible[position]
+        self.tree.delete(item)
+
+    def insert(self, name, x, y, quadrant):
+        self.rows[name] = (x, y, quadrant)
+        self.added[name] = next(self.counter)
+        if self.matches(name):
+            self._show(name)
+
+    def update(self, name, x, y, quadrant):
+        """Refresh one row, moving it only if its sort position changed"""
+        if name not in self.rows:
+            return
+        item = self.items.get(name)
+        if item is None:
+            self.rows[name] = (x, y, quadrant)
+            return
+
+        old_key = self.sort_key(name)
+        self.rows[name] = (x, y, quadrant)
+        new_key = self.sort_key(name)
+        if new_key != old_key:
+            del self.visible[bisect.bisect_left(self.visible, old_key)]
+            position = bisect.bisect_left(self.visible, new_key)
+            self.visible.insert(position, new_key)
+            self.tree.move(item, '', self.tree_index(position))
+        self.tree.item(item, values=(f"{x:.0f}", f"{y:.0f}", quadrant))
+
+    def delete(self, name):
+        self._hide(name)
+        self.rows.pop(name, None)
+        self.added.pop(name, None)
+
+    def delete_many(self, names):
+        """Delete a batch of rows with one Treeview call and one pass over the shown rows"""
+        names = set(names)
+        items = [self.items.pop(name) for name in names if name in self.items]
+        if items:
+            for item in items:
+                del self.names[item]
+            self.visible = [key for key in self.visible if key[-1] not in names]
+            self.tree.delete(*items)
+        for name in names:
+            self.rows.pop(name, None)
+            self.added.pop(name, None)
+
+    def clear(self):
+        self.tree.delete(*self.items.values())
+        self.rows.clear()
+        self.added.clear()
+        self.items.clear()
+        self.names.clear()
+        self.visible.clear()
+
+    def rebuild(self, rows):
+        """Replace the whole list from an iterable of (name, x, y, quadrant)"""
+        self.clear()
+        for name, x, y, quadrant in rows:
+            self.rows[name] = (x, y, quadrant)
+            self.added[name] = next(self.counter)
+        self.refresh()
+
+    def refresh(self):
+        """Re-materialise the rows matching the filter in sorted order"""
+        self.tree.delete(*self.items.values())
+        self.items.clear()
+        self.names.clear()
+        self.visible = sorted(self.sort_key(name) for name in self.rows if self.matches(name))
+
+        ordered = reversed(self.visible) if self.descending else self.visible
+        for _, name in ordered:
+            x, y, quadrant = self.rows[name]
+            item = self.tree.insert('', tk.END, text=name, values=(f"{x:.0f}", f"{y:.0f}", quadrant))
+            self.items[name] = item
+            self.names[item] = name
+
+    def set_filter(self, text):
+        """Show only names containing text (case-insensitive)"""
+        text = text.strip().lower()
+        if text == self.filter_text:
+            return
+        narrowing = text.startswith(self.filter_text)
+        self.filter_text = text
+
+        if narrowing:
+            # Typing more characters can only hide rows, so prune the shown ones
+            for name in [name for name in self.items if not self.matches(name)]:
+                self._hide(name)
+        else:
+            self.refresh()
+
+    def sort_by(self, column):
+        """Sort by a column; choosing the same column again flips the order"""
+        if column == self.sort_column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        selected = self.selected_name()
+        self.refresh()
+        if selected is not None:
+            self.select(selected)
+
+    def selected_name(self):
+        selection = self.tree.selection()
+        if selection:
+            return self.names.get(selection[0])
+        return None
+
+    def select(self, name):
+        item = self.items.get(name)
+        if item is not None:
+            self.tree.selection_set(item)
+            self.tree.see(item)
@@ -0,0 +1,268 @@
+import sys
+
+import numpy as np
+
+from projection import ProjectionCache
+
+# Quadrant names, indexed by the int8 codes kept in PeopleStore.quadrant_codes
+QUADRANTS = ("Gnatty NPC", "Not NPC", "Not Non-NPC", "Gnatty Non-NPC")
+QUADRANT_CODES = {name: code for code, name in enumerate(QUADRANTS)}
+
+
+def quadrant_code(x, y):
+    """Determine which quadrant a point is in, as an index into QUADRANTS"""
+    if x >= 0 and y >= 0:
+        return 0
+    elif x < 0 and y >= 0:
+        return 1
+    elif x < 0 and y < 0:
+        return 2
+    else:  # x >= 0 and y < 0
+        return 3
+
+
+def get_quadrant(x, y):
+    """Determine which quadrant a point is in"""
+    return QUADRANTS[quadrant_code(x, y)]
+
+
+def classify_quadrants(xs, ys):
+    """Vectorised quadrant_code over coordinate arrays, returning int8 codes"""
+    east = np.asarray(xs) >= 0
+    north = np.asarray(ys) >= 0
+    return np.where(north, np.where(east, 0, 1), np.where(east, 3, 2)).astype(np.int8)
+
+
+class PersonRecord:
+    """One person; traits and quadrant live in the store's arrays"""
+
+    __slots__ = ('store', 'name', 'row', 'date_added')
+
+    def __init__(self, store, name, row, date_added):
+        self.store = store
+        self.name = name
+        self.row = row
+        self.date_added = date_added
+
+    @property
+    def x(self):
+        return float(self.store.traits[self.row, 0])
+
+    @property
+    def y(self):
+        return float(self.store.traits[self.row, 1])
+
+    @property
+    def traits(self):
+        """Values on every axis, starting with x and y"""
+        return self.store.traits[self.row].tolist()
+
+    @property
+    def quadrant(self):
+        return QUADRANTS[self.store.quadrant_codes[self.row]]
+
+    def __repr__(self):
+        return f"PersonRecord({self.name!r}, x={self.x:.1f}, y={self.y:.1f}, quadrant={self.quadrant!r})"
+
+
+class PeopleStore:
+    """Headless, array-backed roster of people
+
+    Every person has a trait vector with one value per axis, kept as a row
+    of one float64 (n, dims) matrix. The first two axes are the compass x
+    and y, which decide the quadrant (kept in an int8 array by row). A
+    name -> record map sits on top. Removing a person moves the last row into
+    the freed slot so the arrays stay dense. Nothing here depends on Tk or
+    matplotlib.
+    """
+
+    def __init__(self, capacity=64, dims=2):
+        self.traits = np.empty((capacity, dims), dtype=float)
+        self.quadrant_codes = np.empty(capacity, dtype=np.int8)
+        self.records = []  # row -> PersonRecord
+        self.by_name = {}  # {name: PersonRecord}
+        self.projections = ProjectionCache(self)  # 2D views of the trait vectors, told about every change
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def __iter__(self):
+        return iter(self.by_name)
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def get(self, name, default=None):
+        return self.by_name.get(name, default)
+
+    def items(self):
+        return self.by_name.items()
+
+    def names(self):
+        return list(self.by_name)
+
+    @property
+    def dims(self):
+        """Number of trait axes, including x and y"""
+        return self.traits.shape[1]
+
+    @property
+    def xy(self):
+        """(capacity, 2) view of the x and y columns"""
+        return self.traits[:, :2]
+
+    @property
+    def coords(self):
+        """(n, 2) view of every position, in row order"""
+        return self.traits[:len(self.records), :2]
+
+    @property
+    def vectors(self):
+        """(n, dims) view of every trait vector, in row order"""
+        return self.traits[:len(self.records)]
+
+    @property
+    def codes(self):
+        """View of every quadrant code, in row order"""
+        return self.quadrant_codes[:len(self.records)]
+
+    def _reserve(self, count):
+        """Grow the arrays (doubling) so count more rows fit"""
+        needed = len(self.records) + count
+        capacity = len(self.traits)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        traits = np.empty((capacity, self.dims), dtype=float)
+        codes = np.empty(capacity, dtype=np.int8)
+        traits[:len(self.records)] = self.vectors
+        codes[:len(self.records)] = self.codes
+        self.traits = traits
+        self.quadrant_codes = codes
+
+    def add_axis(self):
+        """Append a trait axis with everyone at 0 on it; returns its index"""
+        traits = np.zeros((len(self.traits), self.dims + 1), dtype=float)
+        traits[:, :-1] = self.traits
+        self.traits = traits
+        self.projections.reset()  # The old principal axes have the wrong length
+        return self.dims - 1
+
+    def _fill_traits(self, row, extra):
+        """Write the values past x and y for one row, padding missing axes with 0"""
+        values = list(extra or ())[:self.dims - 2]
+        self.traits[row, 2:] = 0.0
+        self.traits[row, 2:2 + len(values)] = values
+
+    def add(self, name, x, y, date_added="Unknown", quadrant=None, extra=None):
+        """Add one person and return their record"""
+        return self.add_many([(name, x, y, date_added, quadrant)], [extra])[0]
+
+    def add_many(self, people, extra=None):
+        """Add (name, x, y, date_added, quadrant) tuples; quadrant may be None
+
+        extra optionally holds, for each tuple, the person's values on the
+        axes after x and y (missing values are 0). Names already in the store
+        are skipped. Returns the new records.
+        """
+        people = list(people)
+        extra = [None] * len(people) if extra is None else list(extra)
+        self._reserve(len(people))
+        start = len(self.records)
+
+        added = []
+        for (name, x, y, date_added, quadrant), values in zip(people, extra):
+            if name in self.by_name:
+                continue
+            row = len(self.records)
+            self.traits[row, :2] = (x, y)
+            if self.dims > 2:
+                self._fill_traits(row, values)
+            code = QUADRANT_CODES.get(quadrant)
+            self.quadrant_codes[row] = quadrant_code(x, y) if code is None else code
+
+            # Many people share a date string, so keep one copy of each
+            record = PersonRecord(self, name, row, sys.intern(str(date_added)))
+            self.records.append(record)
+            self.by_name[name] = record
+            added.append(record)
+        self.projections.rows_changed(start, len(self.records))
+        return added
+
+    def add_arrays(self, names, xy, date_added="Unknown"):
+        """Add a block of people from a name list and an (n, k) array
+
+        The array holds x and y, optionally followed by values on further
+        axes (axes it leaves out are 0). Quadrants are classified for the
+        whole block at once and the arrays are filled with slice assignments.
+        date_added is one string for everyone or a list with one per person.
+        Names must not already be in the store. Returns the new records.
+        """
+        xy = np.asarray(xy, dtype=float)
+        xy = xy.reshape(len(names), -1) if xy.size else np.empty((0, 2))
+        self._reserve(len(names))
+        start = len(self.records)
+        end = start + len(names)
+        columns = min(xy.shape[1], self.dims)
+        self.traits[start:end, :columns] = xy[:, :columns]
+        self.traits[start:end, columns:] = 0.0
+        self.quadrant_codes[start:end] = classify_quadrants(xy[:, 0], xy[:, 1])
+
+        if isinstance(date_added, str):
+            dates = [sys.intern(date_added)] * len(names)
+        else:
+            dates = [sys.intern(str(date)) for date in date_added]
+        added = [PersonRecord(self, name, row, date) for row, (name, date) in enumerate(zip(names, dates), start)]
+        self.records.extend(added)
+        self.by_name.update((record.name, record) for record in added)
+        self.projections.rows_changed(start, end)
+        return added
+
+    def move(self, name, x, y):
+        """Update a position; the quadrant only changes through reclassify"""
+        row = self.by_name[name].row
+        self.traits[row, :2] = (x, y)
+        self.projections.row_changed(row)
+
+    def set_traits(self, name, axes, values):
+        """Set a person's values on the given axes; the quadrant only changes through reclassify"""
+        row = self.by_name[name].row
+        self.traits[row, list(axes)] = values
+        self.projections.row_changed(row)
+
+    def reclassify(self, name):
+        """Recompute a person's quadrant from their position
+
+        Returns (old_quadrant, new_quadrant).
+        """
+        record = self.by_name[name]
+        old = record.quadrant
+        x, y = self.traits[record.row, :2]
+        self.quadrant_codes[record.row] = quadrant_code(x, y)
+        return old, record.quadrant
+
+    def remove(self, name):
+        record = self.by_name.pop(name)
+        row = record.row
+        last = len(self.records) - 1
+        if row != last:
+            # Keep the arrays dense: the last person takes over the freed row
+            moved = self.records[last]
+            self.traits[row] = self.traits[last]
+            self.quadrant_codes[row] = self.quadrant_codes[last]
+            self.projections.row_moved(last, row)
+            moved.row = row
+            self.records[row] = moved
+        self.records.pop()
+        record.row = -1
+
+    def clear(self):
+        for record in self.records:
+            record.row = -1
+        self.records.clear()
+        self.by_name.clear()
+        self.projections.reset()
@@ -0,0 +1,93 @@
+import bisect
+import functools
+import time
+from collections import deque
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class PerfMonitor:
+    """Rolling timings for named hot paths
+
+    Each name keeps its last `window` samples as (finished_at, seconds), plus
+    a lifetime count and total. Recording a sample is two perf_counter calls
+    and a deque append, so wrapping event handlers costs microseconds.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self.samples = {}  # {name: deque of (finished_at, seconds)}
+        self.counts = {}  # {name: samples recorded since startup}
+        self.totals = {}  # {name: seconds spent since startup}
+
+    def record(self, name, seconds, finished_at=None):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.counts[name] = 0
+            self.totals[name] = 0.0
+        samples.append((time.perf_counter() if finished_at is None else finished_at, seconds))
+        self.counts[name] += 1
+        self.totals[name] += seconds
+
+    def wrap(self, name, func):
+        """Return func with every call timed under name"""
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                self.record(name, end - start, end)
+        return timed
+
+    def percentile(self, name, fraction):
+        """Duration in seconds below which `fraction` of the recent samples fall"""
+        durations = sorted(seconds for _, seconds in self.samples.get(name, ()))
+        if not durations:
+            return None
+        return durations[min(len(durations) - 1, int(fraction * len(durations)))]
+
+    def mean(self, name):
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        return sum(seconds for _, seconds in samples) / len(samples)
+
+    def rate(self, names, period=1.0):
+        """Calls per second over the last `period` seconds, summed across names"""
+        cutoff = time.perf_counter() - period
+        calls = 0
+        for name in names:
+            for finished_at, _ in reversed(self.samples.get(name, ())):
+                if finished_at < cutoff:
+                    break
+                calls += 1
+        return calls / period
+
+    def histogram(self, name):
+        """Counts of recent samples per BUCKETS_MS bucket (one extra for the rest)"""
+        counts = [0] * (len(BUCKETS_MS) + 1)
+        for _, seconds in self.samples.get(name, ()):
+            counts[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        return counts
+
+    def summary(self):
+        """{name: {...}} of lifetime and rolling figures, in milliseconds"""
+        summary = {}
+        for name in sorted(self.samples):
+            summary[name] = {
+                "calls": self.counts[name],
+                "total_ms": self.totals[name] * 1000,
+                "recent_samples": len(self.samples[name]),
+                "mean_ms": self.mean(name) * 1000,
+                "p50_ms": self.percentile(name, 0.50) * 1000,
+                "p95_ms": self.percentile(name, 0.95) * 1000,
+                "p99_ms": self.percentile(name, 0.99) * 1000,
+                "max_ms": max(seconds for _, seconds in self.samples[name]) * 1000,
+                "histogram": dict(zip([f"<{bound}ms" for bound in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}ms"],
+                                      self.histogram(name)))
+            }
+        return summary
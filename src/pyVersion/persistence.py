@@ -0,0 +1,377 @@
+import json
+import os
+import queue
+import sqlite3
+import stat
+import tempfile
+import threading
+
+from peopleStore import QUADRANTS, get_quadrant
+
+_STOP = object()
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file next to path, fsync it, then swap it into place
+
+    os.replace is atomic, so readers (and a crash mid-write) only ever see the
+    old file or the complete new one, never a truncated file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            # mkstemp creates files as 0600; keep the permissions the file had before
+            mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+            os.chmod(tmp_path, mode)
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Persist the rename itself (not supported for directories on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def read_journal(path, end=None):
+    """Return the entries in a JSON Lines edit journal, up to byte offset end
+
+    A crash while appending can leave a partial last line; unreadable lines
+    are skipped rather than failing the whole load.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, 'rb') as f:
+        data = f.read() if end is None else f.read(end)
+        for line in data.decode('utf-8').splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping unreadable journal line in {path}")
+    return entries
+
+
+def encode_traits(person):
+    """The values past x and y as a JSON column, or None on a two-axis compass"""
+    traits = person.get('traits')
+    return json.dumps(traits) if traits else None
+
+
+def encode_metadata(value):
+    """Store lists (the axis names) as JSON and everything else as text"""
+    return json.dumps(value) if isinstance(value, list) else str(value)
+
+
+def read_json_people(data):
+    """Return the people dict from either the current or the oldest file format"""
+    if "people" in data:
+        return data["people"]
+    return data  # Old format: the whole file is {name: {'x': ..., 'y': ...}}
+
+
+class JsonStorage:
+    """people_data.json snapshots plus the edit_history.jsonl journal
+
+    Every save rewrites the whole people snapshot, so the writer only needs
+    the newest one. load/load_history run on the Tk thread at startup; every
+    other method runs on the BackgroundWriter thread.
+    """
+
+    full_snapshots = True
+
+    def __init__(self, data_dir):
+        self.data_file = os.path.join(data_dir, "people_data.json")
+        self.journal_file = os.path.join(data_dir, "edit_history.jsonl")
+        self.journal = None  # Opened lazily on the writer thread
+        self.needs_resave = False  # True after migrating a v2.1 file
+        self.history_end = None  # Journal size at load time; later bytes are this session's
+
+    def describe(self):
+        return self.data_file
+
+    def load(self):
+        """Return (metadata, people) or None if nothing has been saved yet"""
+        loaded_data = None
+        if os.path.exists(self.data_file):
+            with open(self.data_file, 'r') as f:
+                loaded_data = json.load(f)
+
+        if loaded_data is not None and "edit_history" in loaded_data:
+            # v2.1 embedded the history; move it into the journal once
+            if not os.path.exists(self.journal_file):
+                self.append_edits(loaded_data["edit_history"])
+                self.close()
+            self.needs_resave = True
+
+        # The history itself is only parsed if someone asks for it
+        self.history_end = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+
+        if loaded_data is None:
+            return None
+        return loaded_data.get("metadata", {}), read_json_people(loaded_data)
+
+    def load_history(self):
+        """Return the edits saved before this session was loaded"""
+        return read_journal(self.journal_file, self.history_end)
+
+    def append_edits(self, entries):
+        if self.journal is None:
+            self.journal = open(self.journal_file, 'a+')
+            # Terminate a partial line left by a crash so new entries stay readable
+            if self.journal.tell() > 0:
+                self.journal.seek(self.journal.tell() - 1)
+                if self.journal.read(1) != "\n":
+                    self.journal.write("\n")
+        for entry in entries:
+            self.journal.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def save(self, metadata, people, deleted=(), cleared=False):
+        """Write the full snapshot; people always holds everyone"""
+        write_json_atomic(self.data_file, {
+            "metadata": dict(metadata, journal=os.path.basename(self.journal_file)),
+            "people": people
+        })
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+
+class SqliteStorage:
+    """Embedded SQLite database holding people, edit history and metadata
+
+    Saves are row-level: only people changed since the last save are
+    upserted, so the cost of a save follows the size of the edit rather than
+    the roster. The database runs in WAL mode so the startup read connection
+    and the writer thread's connection never block each other.
+    """
+
+    full_snapshots = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS people (
+            name TEXT PRIMARY KEY,
+            x REAL NOT NULL,
+            y REAL NOT NULL,
+            quadrant TEXT NOT NULL,
+            date_added TEXT,
+            last_moved TEXT,
+            traits TEXT
+        );
+        CREATE INDEX IF NOT EXISTS people_quadrant ON people (quadrant);
+        CREATE TABLE IF NOT EXISTS edit_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            action TEXT NOT NULL,
+            details TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS edit_history_timestamp ON edit_history (timestamp);
+        CREATE TABLE IF NOT EXISTS metadata (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, data_dir):
+        self.db_file = os.path.join(data_dir, "people_data.sqlite3")
+        self.json_storage = JsonStorage(data_dir)  # Source for migrating existing data
+        self.conn = None  # Writer thread connection, opened lazily
+        self.needs_resave = False
+        self.history_end = None  # Last edit id at load time; later rows are this session's
+
+    def describe(self):
+        return self.db_file
+
+    def connect(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.SCHEMA)
+        # Databases created before trait axes existed lack the column
+        if "traits" not in [row[1] for row in conn.execute("PRAGMA table_info(people)")]:
+            conn.execute("ALTER TABLE people ADD COLUMN traits TEXT")
+        return conn
+
+    def writer_conn(self):
+        if self.conn is None:
+            self.conn = self.connect()
+        return self.conn
+
+    def load(self):
+        """Return (metadata, people), migrating the JSON files into a new database"""
+        conn = self.connect()
+        try:
+            metadata = dict(conn.execute("SELECT key, value FROM metadata"))
+            if not metadata and os.path.exists(self.json_storage.data_file):
+                self.migrate_from_json(conn)
+                metadata = dict(conn.execute("SELECT key, value FROM metadata"))
+            self.history_end = conn.execute("SELECT MAX(id) FROM edit_history").fetchone()[0] or 0
+            if not metadata:
+                return None
+
+            people = {}
+            for name, x, y, quadrant, date_added, last_moved, traits in conn.execute(
+                    "SELECT name, x, y, quadrant, date_added, last_moved, traits FROM people"):
+                people[name] = {'x': x, 'y': y, 'quadrant': quadrant,
+                                'date_added': date_added, 'last_moved': last_moved}
+                if traits:
+                    people[name]['traits'] = json.loads(traits)
+        finally:
+            conn.close()
+
+        for key in ('total_people', 'total_edits'):
+            if key in metadata:
+                metadata[key] = int(metadata[key])
+        if 'axes' in metadata:
+            metadata['axes'] = json.loads(metadata['axes'])
+        return metadata, people
+
+    def migrate_from_json(self, conn):
+        """Copy people_data.json (v2.1 or v2.2) and its history into the database"""
+        metadata, people = self.json_storage.load()
+        history = self.json_storage.load_history()
+
+        def quadrant_of(p):
+            # Older files hold quadrant names from before they were renamed; recompute those
+            quadrant = p.get('quadrant')
+            return quadrant if quadrant in QUADRANTS else get_quadrant(float(p['x']), float(p['y']))
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO people (name, x, y, quadrant, date_added, last_moved, traits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(name, float(p['x']), float(p['y']), quadrant_of(p),
+                  p.get('date_added', 'Unknown'), p.get('last_moved'), encode_traits(p))
+                 for name, p in people.items()])
+            conn.executemany(
+                "INSERT INTO edit_history (timestamp, action, details) VALUES (?, ?, ?)",
+                [(e.get('timestamp', ''), e.get('action', ''), json.dumps(e.get('details', {}))) for e in history])
+            metadata = dict(metadata, total_people=len(people), migrated_from=self.json_storage.data_file)
+            metadata.pop('journal', None)
+            conn.executemany("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                             [(key, encode_metadata(value)) for key, value in metadata.items()])
+        print(f"Migrated {len(people)} people and {len(history)} edits into {self.db_file}")
+
+    def load_history(self):
+        """Return the edits saved before this session was loaded"""
+        conn = self.connect()
+        try:
+            return [{"timestamp": timestamp, "action": action, "details": json.loads(details)}
+                    for timestamp, action, details in conn.execute(
+                        "SELECT timestamp, action, details FROM edit_history WHERE id <= ? ORDER BY id",
+                        (self.history_end or 0,))]
+        finally:
+            conn.close()
+
+    def append_edits(self, entries):
+        conn = self.writer_conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO edit_history (timestamp, action, details) VALUES (?, ?, ?)",
+                [(e['timestamp'], e['action'], json.dumps(e['details'], separators=(',', ':'))) for e in entries])
+
+    def save(self, metadata, people, deleted=(), cleared=False):
+        """Apply one save as a transaction: clear, deletes, then upserts"""
+        conn = self.writer_conn()
+        with conn:
+            if cleared:
+                conn.execute("DELETE FROM people")
+            conn.executemany("DELETE FROM people WHERE name = ?", [(name,) for name in deleted])
+            conn.executemany(
+                "INSERT INTO people (name, x, y, quadrant, date_added, last_moved, traits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET x = excluded.x, y = excluded.y, "
+                "quadrant = excluded.quadrant, last_moved = excluded.last_moved, traits = excluded.traits",
+                [(name, p['x'], p['y'], p['quadrant'], p['date_added'], p['last_moved'], encode_traits(p))
+                 for name, p in people.items()])
+            conn.executemany("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                             [(key, encode_metadata(value)) for key, value in metadata.items()])
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class BackgroundWriter:
+    """Background thread that feeds edits and saves to a storage backend
+
+    Edits and saves are plain dicts built on the UI thread and never touched
+    again, so the writer can serialise them without locking. Queued edits are
+    written as one batch. For full-snapshot backends only the newest queued
+    save is written; row-level backends apply every save in order.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="compass-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, metadata, people, deleted=(), cleared=False):
+        """Queue a save of the people state"""
+        self.queue.put(('save', (metadata, people, deleted, cleared)))
+
+    def append_edit(self, entry):
+        """Queue one edit entry for the history"""
+        self.queue.put(('edit', entry))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written"""
+        done = threading.Event()
+        self.queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        """Write anything still queued, then stop the thread"""
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not _STOP:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            edits = [item[1] for item in batch if item is not _STOP and item[0] == 'edit']
+            saves = [item[1] for item in batch if item is not _STOP and item[0] == 'save']
+            flushes = [item[1] for item in batch if item is not _STOP and item[0] == 'flush']
+            if saves and self.storage.full_snapshots:
+                # Skip straight to the newest snapshot if the UI got ahead of us
+                saves = saves[-1:]
+
+            if edits:
+                try:
+                    self.storage.append_edits(edits)
+                except Exception as e:
+                    print(f"Error writing edit history: {e}")
+            for save in saves:
+                try:
+                    self.storage.save(*save)
+                except Exception as e:
+                    print(f"Error saving data: {e}")
+            for done in flushes:
+                done.set()
+
+            if batch[-1] is _STOP:
+                self.storage.close()
+                return
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Views are tuples: ("axes", i, j) plots trait i against trait j, ("pca",) the first two principal components
+COMPASS_VIEW = ("axes", 0, 1)
+PCA_VIEW = ("pca",)
+
+
+class ProjectionCache:
+    """2D positions of a PeopleStore's trait vectors for any view
+
+    Axis pair views read straight from the trait matrix. The principal
+    component view is fitted once and then cached as a (capacity, 2) array
+    indexed by store row. The store reports every changed row, so one
+    person's edit reprojects one row with the cached basis instead of the
+    whole roster. The basis itself is only refitted when the view is asked
+    for after more than refit_fraction of the roster has changed.
+    """
+
+    def __init__(self, store, refit_fraction=0.1):
+        self.store = store
+        self.refit_fraction = refit_fraction
+        self.pca_positions = None  # Cached PCA positions by store row, or None before the first fit
+        self.mean = None
+        self.components = None  # (2, dims) unit vectors of the fitted basis
+        self.scale = 1.0  # Shrinks the fitted roster to fit inside the compass
+        self.explained = (0.0, 0.0)  # Fraction of the variance along each component
+        self.changes = 0  # Rows changed since the last fit
+
+    def position(self, view, row):
+        """(x, y) of one store row in a view"""
+        if view[0] == "axes":
+            return float(self.store.traits[row, view[1]]), float(self.store.traits[row, view[2]])
+        positions = self.fitted_positions()
+        return float(positions[row, 0]), float(positions[row, 1])
+
+    def positions(self, view, refresh=False):
+        """(n, 2) array of every store row in a view
+
+        With refresh, a PCA view whose fit has gone stale is refitted first.
+        """
+        if view[0] == "axes":
+            return self.store.vectors[:, list(view[1:])]
+        return self.fitted_positions(refresh)[:len(self.store)]
+
+    def fitted_positions(self, refresh=False):
+        """Cached PCA positions, refitting first if the roster has drifted too far"""
+        if self.pca_positions is None or (refresh and self.changes > self.refit_fraction * len(self.store)):
+            self.fit()
+        return self.pca_positions
+
+    def fit(self):
+        """Fit the principal axes to the whole roster and project everyone"""
+        vectors = self.store.vectors
+        dims = vectors.shape[1]
+        self.mean = vectors.mean(axis=0) if len(vectors) else np.zeros(dims)
+        centred = vectors - self.mean
+        if len(vectors) > 1 and centred.any():
+            # Rows of vt are the principal directions, strongest first
+            _, singular, vt = np.linalg.svd(centred, full_matrices=False)
+            self.components = vt[:2]
+            variance = singular ** 2
+            self.explained = tuple(float(v) for v in variance[:2] / variance.sum())
+        else:
+            self.components = np.eye(dims)[:2]
+            self.explained = (0.0, 0.0)
+
+        projected = centred @ self.components.T
+        reach = np.abs(projected).max() if len(projected) else 0.0
+        self.scale = 100 / reach if reach > 100 else 1.0
+        self.pca_positions = np.empty((len(self.store.traits), 2), dtype=float)
+        self.pca_positions[:len(vectors)] = (projected * self.scale).clip(-100, 100)
+        self.changes = 0
+
+    def _grow(self):
+        capacity = len(self.store.traits)
+        if len(self.pca_positions) < capacity:
+            positions = np.empty((capacity, 2), dtype=float)
+            positions[:len(self.pca_positions)] = self.pca_positions
+            self.pca_positions = positions
+
+    def rows_changed(self, start, end):
+        """Reproject rows start:end with the cached basis after they were added or edited"""
+        self.changes += end - start
+        if self.pca_positions is None:
+            return
+        self._grow()
+        projected = (self.store.traits[start:end] - self.mean) @ self.components.T
+        self.pca_positions[start:end] = (projected * self.scale).clip(-100, 100)
+
+    def row_changed(self, row):
+        self.rows_changed(row, row + 1)
+
+    def row_moved(self, source, target):
+        """Follow the store moving its last row into a freed slot"""
+        self.changes += 1
+        if self.pca_positions is not None:
+            self.pca_positions[target] = self.pca_positions[source]
+
+    def reset(self):
+        """Drop the fit; the next PCA request refits from scratch"""
+        self.pca_positions = None
+        self.mean = None
+        self.components = None
+        self.changes = 0
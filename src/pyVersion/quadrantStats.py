@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+
+from peopleStore import QUADRANTS
+
+
+class QuadrantStats:
+    """Per-quadrant head count, centroid and spread, kept as running sums
+
+    Each quadrant stores [n, sum x, sum y, sum x², sum y²], so every edit is
+    an O(1) update and the figures are derived on demand. Edits arrive as the
+    same entries PersonalityCompass.log_edit writes to the history; the
+    roster itself is never rescanned.
+    """
+
+    def __init__(self):
+        self.sums = {quadrant: [0, 0.0, 0.0, 0.0, 0.0] for quadrant in QUADRANTS}
+        self.version = 0  # Bumped on every change, so views know when to refresh
+
+    def _update(self, quadrant, x, y, sign):
+        sums = self.sums.get(quadrant)
+        if sums is None:
+            return
+        sums[0] += sign
+        sums[1] += sign * x
+        sums[2] += sign * y
+        sums[3] += sign * x * x
+        sums[4] += sign * y * y
+
+    def add(self, quadrant, x, y):
+        self._update(quadrant, x, y, 1)
+        self.version += 1
+
+    def remove(self, quadrant, x, y):
+        self._update(quadrant, x, y, -1)
+        self.version += 1
+
+    def move(self, old_quadrant, old_x, old_y, quadrant, x, y):
+        self._update(old_quadrant, old_x, old_y, -1)
+        self._update(quadrant, x, y, 1)
+        self.version += 1
+
+    def add_many(self, xy, codes):
+        """Add an (n, 2) position array with matching quadrant codes in one pass"""
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        codes = np.asarray(codes)
+        columns = (np.ones(len(xy)), xy[:, 0], xy[:, 1], xy[:, 0] ** 2, xy[:, 1] ** 2)
+        totals = [np.bincount(codes, weights=column, minlength=len(QUADRANTS)) for column in columns]
+        for code, quadrant in enumerate(QUADRANTS):
+            sums = self.sums[quadrant]
+            sums[0] += int(totals[0][code])
+            for i in range(1, 5):
+                sums[i] += float(totals[i][code])
+        self.version += 1
+
+    def clear(self):
+        for sums in self.sums.values():
+            sums[:] = [0, 0.0, 0.0, 0.0, 0.0]
+        self.version += 1
+
+    def apply(self, entry):
+        """Update the sums from one edit history entry; returns True if it changed anything"""
+        action = entry.get("action")
+        details = entry.get("details", {})
+
+        if action == "person_added":
+            position = details["position"]
+            self.add(details["quadrant"], position["x"], position["y"])
+        elif action in ("person_moved", "coordinates_edited", "traits_edited"):
+            if "old_position" not in details:
+                return False  # Entries written before old positions were logged
+            old, new = details["old_position"], details["new_position"]
+            self.move(details["old_quadrant"], old["x"], old["y"],
+                      details["new_quadrant"], new["x"], new["y"])
+        elif action == "person_removed":
+            position = details["position"]
+            self.remove(details["quadrant"], position["x"], position["y"])
+        elif action in ("people_imported", "people_restored", "people_removed"):
+            sign = -1 if action == "people_removed" else 1
+            for person in details["people"].values():
+                self._update(person["quadrant"], person["x"], person["y"], sign)
+            self.version += 1
+        elif action == "all_people_cleared":
+            self.clear()
+        else:
+            return False
+        return True
+
+    def count(self, quadrant):
+        return self.sums[quadrant][0]
+
+    def centroid(self, quadrant):
+        """Mean (x, y) of the quadrant, or None if it is empty"""
+        n, sum_x, sum_y = self.sums[quadrant][:3]
+        if n <= 0:
+            return None
+        return sum_x / n, sum_y / n
+
+    def spread(self, quadrant):
+        """Standard deviation (x, y) of the quadrant, or None if it is empty"""
+        n, sum_x, sum_y, sum_xx, sum_yy = self.sums[quadrant]
+        if n <= 0:
+            return None
+        # Clamp tiny negative variances left by floating point cancellation
+        return (math.sqrt(max(0.0, sum_xx / n - (sum_x / n) ** 2)),
+                math.sqrt(max(0.0, sum_yy / n - (sum_y / n) ** 2)))
+
+    def summary(self):
+        """{quadrant: {"count", "centroid", "spread"}} for every quadrant"""
+        return {quadrant: {"count": self.count(quadrant),
+                           "centroid": self.centroid(quadrant),
+                           "spread": self.spread(quadrant)}
+                for quadrant in QUADRANTS}
@@ -0,0 +1,415 @@
+from collections import deque
+
+import numpy as np
+
+# Labels of the two compass axes; added trait axes follow them
+COMPASS_AXES = ('Not ← → Gnatty', 'Non NPC ← → NPC')
+
+
+def style_compass(ax):
+    """Set up the compass look on an empty axes: limits, titles, grid, centre lines and quadrant labels
+
+    Shared by the app and the batch renderer so saved images match the
+    window. Returns the quadrant label texts.
+    """
+    ax.set_xlim(-100, 100)
+    ax.set_ylim(-100, 100)
+    ax.set_xlabel(COMPASS_AXES[0], fontsize=12, fontweight='bold')
+    ax.set_ylabel(COMPASS_AXES[1], fontsize=12, fontweight='bold')
+    ax.set_title('Personality Compass', fontsize=14, fontweight='bold', pad=20)
+
+    # Add grid
+    ax.grid(True, alpha=0.3)
+
+    # Add quadrant lines
+    ax.axhline(y=0, color='black', linewidth=1.5, alpha=0.8)
+    ax.axvline(x=0, color='black', linewidth=1.5, alpha=0.8)
+
+    # Add quadrant labels (in axes coordinates, so zooming leaves them in place)
+    labels = []
+    for x, y, text, colour in ((1.05, 0.75, 'Gnatty,\nNPC', 'lightblue'),
+                               (-0.05, 0.75, 'Not,\nNPC', 'lightcoral'),
+                               (-0.05, 0.25, 'Not,\nNon NPC', 'lightgreen'),
+                               (1.05, 0.25, 'Gnatty,\nNon NPC', 'lightyellow')):
+        labels.append(ax.text(x, y, text, ha='center', va='center',
+                              fontsize=10, alpha=0.6, fontweight='bold', transform=ax.transAxes,
+                              bbox=dict(boxstyle="round,pad=0.3", facecolor=colour, alpha=0.5)))
+    return labels
+
+
+class ScatterRenderer:
+    """Draws every person as one row of a single array-backed PathCollection
+
+    Name labels are not kept per person. Before each full draw,
+    layout_labels picks which names fit on screen without overlapping
+    (selected and recently moved people first). Those names are drawn from a
+    small pool of reusable annotations, and the layout is cached until
+    positions or the viewport change.
+    """
+
+    def __init__(self, ax, label_limit=1000):
+        self.ax = ax
+        self.rows = {}  # {name: row index into the collection's offsets}
+        self.names = []  # row index -> name
+        self.dragging = None  # Name currently drawn by the animated drag marker
+        self.label_limit = label_limit  # More people than this in view: markers only
+        self.selected = None  # Name highlighted in the People list
+        self.recent = deque(maxlen=20)  # Recently added/moved names, newest last
+        self.version = 0  # Bumped on every change that can affect the label layout
+        self.layout_key = None  # Inputs of the cached label layout
+        self.visible = True  # False while the density view replaces the markers
+        self.labels = {}  # {name: annotation} currently shown
+        self.label_pool = []  # Hidden annotations ready for reuse
+
+        # One collection holds every marker, styled like the old per-person scatter
+        self.collection = ax.scatter(np.empty(0), np.empty(0), s=100, c='red', alpha=0.7,
+                                     edgecolors='darkred', linewidth=2, zorder=5)
+
+        # Stand-in marker and label for the dragged person, only ever drawn by blitting
+        self.drag_marker = ax.scatter([0], [0], s=100, c='red', alpha=0.7,
+                                      edgecolors='darkred', linewidth=2, zorder=5,
+                                      animated=True, visible=False)
+        self.drag_label = self._make_annotation()
+        self.drag_label.set_animated(True)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _make_annotation(self):
+        return self.ax.annotate('', (0, 0), xytext=(8, 8),
+                                textcoords='offset points', fontsize=9,
+                                bbox=dict(boxstyle="round,pad=0.3",
+                                          facecolor='white', alpha=0.9,
+                                          edgecolor='gray'),
+                                zorder=6, ha='left', va='bottom', visible=False)
+
+    def _touch(self, name):
+        """Give a name label priority and invalidate the cached layout"""
+        if name in self.recent:
+            self.recent.remove(name)
+        self.recent.append(name)
+        self.version += 1
+
+    def add(self, name, x, y):
+        """Append a single person to the collection"""
+        self.add_many([(name, x, y)])
+        self._touch(name)
+
+    def add_many(self, people):
+        """Append a batch of (name, x, y) tuples with a single offsets update"""
+        people = [p for p in people if p[0] not in self.rows]
+        if not people:
+            return
+
+        new_offsets = np.array([(x, y) for _, x, y in people], dtype=float)
+        offsets = np.concatenate([self.collection.get_offsets(), new_offsets])
+        self.collection.set_offsets(offsets)
+
+        for name, _, _ in people:
+            self.rows[name] = len(self.names)
+            self.names.append(name)
+        self.version += 1
+
+    def move(self, name, x, y):
+        """Move a person by writing straight into the offsets array"""
+        row = self.rows.get(name)
+        if row is None:
+            return
+
+        if name == self.dragging:
+            # The collection row stays hidden until the drag ends
+            self.drag_marker.set_offsets([[x, y]])
+            self.drag_label.xy = (x, y)
+            return
+
+        self.collection.get_offsets()[row] = (x, y)
+        self.collection.stale = True
+        if name in self.labels:
+            self.labels[name].xy = (x, y)
+        self._touch(name)
+
+    def begin_drag(self, name):
+        """Move a person out of the static collection into the animated drag artists"""
+        row = self.rows.get(name)
+        if row is None:
+            return
+        if self.dragging:
+            self.end_drag()
+
+        offsets = self.collection.get_offsets()
+        self.drag_marker.set_offsets([offsets[row]])
+        self.drag_marker.set_visible(True)
+        self.drag_label.set_text(name)
+        self.drag_label.xy = tuple(offsets[row])
+        self.drag_label.set_visible(True)
+
+        # The cached background must not contain the person's static marker or label
+        self._hide_label(name)
+        offsets[row] = (np.nan, np.nan)  # NaN offsets are skipped when drawing
+        self.collection.stale = True
+        self.dragging = name
+
+    def draw_drag(self):
+        """Draw only the dragged marker and label onto the current canvas"""
+        if self.dragging:
+            self.ax.draw_artist(self.drag_marker)
+            self.ax.draw_artist(self.drag_label)
+
+    def end_drag(self):
+        """Return the dragged person to the static collection"""
+        name = self.dragging
+        if name is None:
+            return
+        self.dragging = None
+
+        self.collection.get_offsets()[self.rows[name]] = self.drag_marker.get_offsets()[0]
+        self.collection.stale = True
+        self.drag_marker.set_visible(False)
+        self.drag_label.set_visible(False)
+        self._touch(name)
+
+    def remove(self, name):
+        """Remove a person by swapping the last row into its slot"""
+        if name == self.dragging:
+            self.end_drag()
+
+        row = self.rows.pop(name, None)
+        if row is None:
+            return
+
+        offsets = self.collection.get_offsets()
+        last = len(self.names) - 1
+        if row != last:
+            # Keep the array dense: the last person takes over the freed row
+            moved_name = self.names[last]
+            offsets[row] = offsets[last]
+            self.names[row] = moved_name
+            self.rows[moved_name] = row
+        self.names.pop()
+        self.collection.set_offsets(offsets[:last])
+
+        self._hide_label(name)
+        if name in self.recent:
+            self.recent.remove(name)
+        if name == self.selected:
+            self.selected = None
+        self.version += 1
+
+    def remove_many(self, names):
+        """Remove a batch of people with one compaction of the offsets array"""
+        names = {name for name in names if name in self.rows}
+        if not names:
+            return
+        if self.dragging in names:
+            self.end_drag()
+
+        keep = np.ones(len(self.names), dtype=bool)
+        keep[[self.rows[name] for name in names]] = False
+        self.collection.set_offsets(self.collection.get_offsets()[keep])
+        self.names = [name for name in self.names if name not in names]
+        self.rows = {name: row for row, name in enumerate(self.names)}
+
+        for name in names & self.labels.keys():
+            self._hide_label(name)
+        self.recent = deque((name for name in self.recent if name not in names), maxlen=self.recent.maxlen)
+        if self.selected in names:
+            self.selected = None
+        self.version += 1
+
+    def clear(self):
+        """Remove every person from the plot"""
+        self.end_drag()
+        for name in list(self.labels):
+            self._hide_label(name)
+        self.rows.clear()
+        self.names.clear()
+        self.recent.clear()
+        self.selected = None
+        self.collection.set_offsets(np.empty((0, 2)))
+        self.version += 1
+
+    def replace(self, people):
+        """Swap the whole collection for a new list of (name, x, y), e.g. after the view moved"""
+        self.end_drag()
+        people = list(people)
+        self.names = [name for name, _, _ in people]
+        self.rows = {name: row for row, name in enumerate(self.names)}
+        self.collection.set_offsets(np.array([(x, y) for _, x, y in people], dtype=float).reshape(-1, 2))
+        for name in [name for name in self.labels if name not in self.rows]:
+            self._hide_label(name)
+        self.version += 1
+
+    def set_visible(self, visible):
+        """Show or hide the markers and name labels (the drag marker is unaffected)"""
+        self.visible = visible
+        self.collection.set_visible(visible)
+        self.version += 1
+
+    def set_selected(self, name):
+        """Always label the person selected in the People list"""
+        if name != self.selected:
+            self.selected = name
+            self.version += 1
+
+    def _hide_label(self, name):
+        annotation = self.labels.pop(name, None)
+        if annotation is not None:
+            annotation.set_visible(False)
+            self.label_pool.append(annotation)
+
+    def _show_label(self, name, x, y):
+        annotation = self.label_pool.pop() if self.label_pool else self._make_annotation()
+        annotation.set_text(name)
+        annotation.xy = (x, y)
+        annotation.set_visible(True)
+        self.labels[name] = annotation
+
+    def layout_labels(self):
+        """Choose which names to label so that no two labels overlap
+
+        Labels are placed greedily, in priority order, on a coarse occupancy
+        grid in pixel space. The result is cached until people change or the
+        view (limits, figure size, dpi) changes.
+        """
+        fig = self.ax.figure
+        key = (self.version, self.ax.get_xlim(), self.ax.get_ylim(),
+               tuple(fig.bbox.size), fig.dpi)
+        if key == self.layout_key:
+            return
+        self.layout_key = key
+
+        offsets = np.asarray(self.collection.get_offsets(), dtype=float)
+        pixels = self.ax.transData.transform(offsets) if len(offsets) else np.empty((0, 2))
+        box = self.ax.bbox
+        in_view = ((pixels[:, 0] >= box.x0) & (pixels[:, 0] <= box.x1) &
+                   (pixels[:, 1] >= box.y0) & (pixels[:, 1] <= box.y1))
+        visible_rows = np.flatnonzero(in_view)
+
+        # Priority first: selected, then most recently moved; the rest only if few enough
+        priority = [self.selected] if self.selected else []
+        priority += [name for name in reversed(self.recent) if name != self.selected]
+        candidates = [self.rows[name] for name in priority if name in self.rows and in_view[self.rows[name]]]
+        if not self.visible:
+            candidates = []
+        elif len(visible_rows) <= self.label_limit:
+            seen = set(candidates)
+            candidates += [row for row in visible_rows.tolist() if row not in seen]
+
+        # Label box size in pixels, approximated from the 9pt font
+        points = fig.dpi / 72
+        char_width = 9 * 0.6 * points
+        label_height = (9 + 6) * points
+        offset = 8 * points
+        cell = max(4.0, label_height / 2)
+
+        occupied = set()
+        placed = []
+        for row in candidates:
+            if row == self.rows.get(self.dragging):
+                continue
+            name = self.names[row]
+            px, py = pixels[row]
+            x0 = px + offset
+            y0 = py + offset
+            x1 = x0 + len(name) * char_width + 6 * points
+            y1 = y0 + label_height
+            cells = [(cx, cy)
+                     for cx in range(int(x0 // cell), int(x1 // cell) + 1)
+                     for cy in range(int(y0 // cell), int(y1 // cell) + 1)]
+            if any(c in occupied for c in cells):
+                continue
+            occupied.update(cells)
+            placed.append(row)
+            if len(placed) >= self.label_limit:
+                break
+
+        # Reuse annotations: keep labels that stay, recycle the rest
+        wanted = {self.names[row]: row for row in placed}
+        for name in [name for name in self.labels if name not in wanted]:
+            self._hide_label(name)
+        for name, row in wanted.items():
+            x, y = offsets[row]
+            if name in self.labels:
+                self.labels[name].xy = (x, y)
+            else:
+                self._show_label(name, x, y)
+
+
+class DensityRenderer:
+    """Draws a DensityGrid as a heatmap image in place of the individual markers"""
+
+    def __init__(self, ax, grid):
+        self.ax = ax
+        self.grid = grid
+        self.drawn_version = None  # Grid version the image data was built from
+        self.image = ax.imshow(np.ma.masked_all(grid.counts.shape), extent=grid.extent,
+                               origin='lower', cmap='Reds', interpolation='nearest',
+                               aspect='auto', alpha=0.8, zorder=4, visible=False)  # Masked (empty) bins stay transparent
+
+    def set_visible(self, visible):
+        self.image.set_visible(visible)
+
+    def update(self):
+        """Refresh the image from the grid if it changed since the last draw"""
+        if not self.image.get_visible() or self.drawn_version == self.grid.version:
+            return
+        self.drawn_version = self.grid.version
+
+        # Log scale so a few dense clusters do not wash out everything else
+        counts = self.grid.counts
+        self.image.set_data(np.ma.masked_equal(np.log1p(counts), 0))
+        self.image.set_clim(0, max(np.log1p(counts.max()), 1))
+
+
+class HighlightRenderer:
+    """Draws query results over the markers
+
+    Neighbour and radius searches ring the people found, mark the person
+    searched from and, for a radius, draw the circle. Clusters recolour
+    everyone found, one colour per cluster, with people in no cluster grey.
+    """
+
+    def __init__(self, ax, outline_limit=1000):
+        # matplotlib is already loaded once there is an axes to draw on
+        from matplotlib import colormaps
+        from matplotlib.patches import Circle
+
+        self.ax = ax
+        self.outline_limit = outline_limit  # More cluster spots than this: drawn without outlines, which is ~3x faster
+        self.palette = colormaps['tab10'].colors
+        self.rings = ax.scatter(np.empty(0), np.empty(0), s=220, facecolors='none',
+                                edgecolors='royalblue', linewidth=2, zorder=5.5)
+        self.spots = ax.scatter(np.empty(0), np.empty(0), s=100, alpha=0.9,
+                                edgecolors='black', linewidth=0.5, zorder=5.5)
+        self.centre = ax.scatter([0], [0], s=260, marker='*', c='gold', edgecolors='black',
+                                 linewidth=1, zorder=5.6, visible=False)
+        self.circle = Circle((0, 0), 1, fill=False, linestyle='--', edgecolor='royalblue',
+                             linewidth=1.5, zorder=5.5, visible=False)
+        ax.add_patch(self.circle)
+
+    def show_neighbours(self, xy, centre, radius=None):
+        """Ring an (n, 2) array of positions found around centre, circling radius if given"""
+        self.clear()
+        self.rings.set_offsets(np.asarray(xy, dtype=float).reshape(-1, 2))
+        self.centre.set_offsets([centre])
+        self.centre.set_visible(True)
+        if radius is not None:
+            self.circle.center = centre
+            self.circle.set_radius(radius)
+            self.circle.set_visible(True)
+
+    def show_clusters(self, xy, labels):
+        """Colour an (n, 2) array of positions by cluster label (negative labels are noise)"""
+        self.clear()
+        labels = np.asarray(labels)
+        colours = np.array(self.palette)[labels % len(self.palette)]
+        colours[labels < 0] = (0.75, 0.75, 0.75)
+        self.spots.set_offsets(np.asarray(xy, dtype=float).reshape(-1, 2))
+        self.spots.set_facecolors(colours)
+        self.spots.set_linewidth(0.5 if len(labels) <= self.outline_limit else 0)
+
+    def clear(self):
+        self.rings.set_offsets(np.empty((0, 2)))
+        self.spots.set_offsets(np.empty((0, 2)))
+        self.centre.set_visible(False)
+        self.circle.set_visible(False)
@@ -0,0 +1,360 @@
+import bisect
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from density import DensityGrid
+from renderer import DensityRenderer, ScatterRenderer, style_compass
+
+
+def replay_step(entry):
+    """Turn an edit history entry into a replay step, or None if it changes nobody
+
+    Steps are small tuples:
+
+        ("add", names, rows)          # rows: (n, 2 + extra axes) array of x, y and further trait values
+        ("set", name, axes, values)   # A move along any axes
+        ("remove", names)
+        ("clear",)
+        ("axis",)                     # A new axis, everyone at 0 on it
+    """
+    action = entry.get("action")
+    details = entry.get("details", {})
+
+    if action == "person_added":
+        position = details["position"]
+        return ("add", [details["name"]], np.array([[position["x"], position["y"]] + details.get("traits", [])]))
+    if action in ("person_moved", "coordinates_edited"):
+        if "new_position" not in details:
+            return None
+        position = details["new_position"]
+        return ("set", details["name"], (0, 1), (position["x"], position["y"]))
+    if action == "traits_edited":
+        return ("set", details["name"], tuple(details["axes"]), tuple(details["new_values"]))
+    if action == "person_removed":
+        return ("remove", [details["name"]])
+    if action in ("people_imported", "people_restored"):
+        people = details["people"]
+        rows = np.array([[p["x"], p["y"]] + p.get("traits", []) for p in people.values()], dtype=float)
+        return ("add", list(people), rows.reshape(len(people), -1) if people else rows.reshape(0, 2))
+    if action == "people_removed":
+        return ("remove", list(details["people"]))
+    if action == "all_people_cleared":
+        return ("clear",)
+    if action == "axis_added":
+        return ("axis",)
+    return None
+
+
+class HistoryReplay:
+    """Rebuilds the roster as it was after any edit in the history
+
+    Replaying starts from an empty roster. As steps are replayed for the
+    first time, a checkpoint (names plus a copy of the trait array) is taken
+    once the people touched since the last one reach checkpoint_every, or a
+    tenth of the roster if that is larger. Seeking restores the nearest
+    checkpoint at or before the target and replays forward from there, so a
+    seek costs one O(roster) copy plus at most one interval of steps,
+    however long the history is, and checkpoints hold about ten positions
+    per step replayed. Moving forward from the current position replays
+    only the steps between.
+    """
+
+    def __init__(self, history, checkpoint_every=1000):
+        self.steps = []
+        self.timestamps = []  # Timestamp of each step, for seeking by time
+        for entry in history:
+            step = replay_step(entry)
+            if step is not None:
+                self.steps.append(step)
+                self.timestamps.append(entry.get("timestamp", ""))
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = [(0, [], np.zeros((0, 2)))]  # [(position, names, vectors)] in position order
+        self.checkpoint_positions = [0]
+        self.frontier = 0  # Steps replayed at least once, all covered by checkpoints
+        self.work = 0  # People touched between the last checkpoint and the frontier
+
+        self.names = []  # row -> name
+        self.rows = {}  # {name: row}
+        self.vectors = np.zeros((64, 2))  # Rows beyond len(names) are spare capacity
+        self.position = 0  # Steps applied to the current state
+        self.changed = set()  # Names touched since the last take_changes, or None for everyone
+
+    def __len__(self):
+        return len(self.steps)
+
+    @property
+    def people(self):
+        return len(self.names)
+
+    def positions(self):
+        """(n, 2) x, y array of the current roster, in the order of names"""
+        return self.vectors[:len(self.names), :2]
+
+    def timestamp(self, position):
+        """Timestamp of the edit that brought the roster to position ('' before the first edit)"""
+        return self.timestamps[position - 1] if position > 0 else ""
+
+    def index_at(self, timestamp):
+        """Position after every edit made at or before timestamp"""
+        return bisect.bisect_right(self.timestamps, timestamp)
+
+    def seek(self, position):
+        """Bring the roster to the state after the first position steps"""
+        position = min(max(int(position), 0), len(self.steps))
+        nearest = bisect.bisect_right(self.checkpoint_positions, position) - 1
+        if not self.checkpoint_positions[nearest] <= self.position <= position:
+            self.restore(nearest)
+        while self.position < position:
+            step = self.steps[self.position]
+            touched = self.apply(step)
+            self.position += 1
+            if self.position > self.frontier:
+                self.frontier = self.position
+                self.work += touched
+                if self.work >= max(self.checkpoint_every, len(self.names) // 10):
+                    self.checkpoint()
+
+    def take_changes(self):
+        """Names touched since the last call, or None if the whole roster should be redrawn"""
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def checkpoint(self):
+        n = len(self.names)
+        self.checkpoints.append((self.position, list(self.names), self.vectors[:n].copy()))
+        self.checkpoint_positions.append(self.position)
+        self.work = 0
+
+    def restore(self, index):
+        position, names, vectors = self.checkpoints[index]
+        self.names = list(names)
+        self.rows = dict(zip(self.names, range(len(self.names))))
+        self.vectors = np.zeros((max(64, 2 * len(names)), vectors.shape[1]))
+        self.vectors[:len(names)] = vectors
+        self.position = position
+        self.changed = None
+
+    def _touch(self, name):
+        if self.changed is not None:
+            self.changed.add(name)
+
+    def _grow(self, rows, dims):
+        """Make room for rows people and dims axes"""
+        capacity, width = self.vectors.shape
+        if rows > capacity or dims > width:
+            vectors = np.zeros((max(rows, 2 * capacity) if rows > capacity else capacity, max(dims, width)))
+            vectors[:len(self.names), :width] = self.vectors[:len(self.names)]
+            self.vectors = vectors
+
+    def apply(self, step):
+        """Apply one step to the current state; returns the number of people it touched"""
+        kind = step[0]
+        if kind == "add":
+            names, rows = step[1], step[2]
+            self._grow(len(self.names) + len(names), rows.shape[1])
+            indices = []
+            for name in names:
+                index = self.rows.get(name)
+                if index is None:
+                    index = self.rows[name] = len(self.names)
+                    self.names.append(name)
+                indices.append(index)
+            # Re-adding someone already there (e.g. a repeated sync) overwrites them
+            self.vectors[indices] = 0
+            self.vectors[indices, :rows.shape[1]] = rows
+            if self.changed is not None:
+                self.changed.update(names)
+            return len(names)
+        if kind == "set":
+            name, axes, values = step[1:]
+            index = self.rows.get(name)
+            if index is None:
+                return 1
+            self._grow(len(self.names), max(axes) + 1)
+            self.vectors[index, list(axes)] = values
+            self._touch(name)
+            return 1
+        if kind == "remove":
+            for name in step[1]:
+                index = self.rows.pop(name, None)
+                if index is None:
+                    continue
+                # Keep the array dense: the last person takes over the freed row
+                last = len(self.names) - 1
+                if index != last:
+                    moved = self.names[last]
+                    self.names[index] = moved
+                    self.rows[moved] = index
+                    self.vectors[index] = self.vectors[last]
+                self.names.pop()
+                self._touch(name)
+            return len(step[1])
+        if kind == "clear":
+            touched = len(self.names)
+            self.names = []
+            self.rows = {}
+            self.changed = None
+            return touched
+        if kind == "axis":
+            self._grow(len(self.names), self.vectors.shape[1] + 1)
+            return len(self.names)
+        raise ValueError(f"Unknown replay step {kind!r}")
+
+
+class ReplayWindow:
+    """Timeline scrubber and animated playback of a HistoryReplay in its own window
+
+    Playback advances by the chosen number of edits per second of wall
+    time, so slow frames skip edits instead of slowing the replay down.
+    Each frame only moves the markers of people the new edits touched;
+    seeks that restore a checkpoint or touch a large part of the roster
+    replace the whole collection in one array update.
+    """
+
+    SPEEDS = (1, 10, 100, 1000, 10000)  # Edits per second
+
+    def __init__(self, root, history, density=False, label_limit=1000, frame_ms=33):
+        # matplotlib is already loaded once the main window has drawn
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.replay = HistoryReplay(history)
+        self.frame_ms = frame_ms
+        self.play_job = None
+        self.last_frame = None  # perf_counter() of the previous playback frame
+        self.carry = 0.0  # Fraction of an edit owed from the previous frame
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Replay History")
+        self.window.geometry("800x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.fig = Figure(figsize=(8, 6), dpi=100, facecolor='white')
+        self.ax = self.fig.add_subplot(111)
+        style_compass(self.ax)
+        self.renderer = ScatterRenderer(self.ax, label_limit=label_limit)
+        self.density = DensityGrid()
+        self.heatmap = DensityRenderer(self.ax, self.density)
+        self.canvas = FigureCanvasTkAgg(self.fig, self.window)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        self.play_btn = ttk.Button(controls, text="Play", width=6, command=self.toggle_play)
+        self.play_btn.pack(side=tk.LEFT)
+        self.position_var = tk.DoubleVar(value=len(self.replay))
+        self.scale = ttk.Scale(controls, from_=0, to=len(self.replay), variable=self.position_var,
+                               command=self.on_scrub)
+        self.scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.speed_box = ttk.Combobox(controls, state='readonly', width=14,
+                                      values=[f"{speed} edits/s" for speed in self.SPEEDS])
+        self.speed_box.current(2)
+        self.speed_box.pack(side=tk.LEFT)
+
+        status = ttk.Frame(self.window, padding="5")
+        status.pack(fill=tk.X)
+        self.status_var = tk.StringVar()
+        ttk.Label(status, textvariable=self.status_var).pack(side=tk.LEFT)
+        self.density_var = tk.BooleanVar(value=density)
+        ttk.Checkbutton(status, text="Density view", variable=self.density_var,
+                        command=self.toggle_density).pack(side=tk.RIGHT)
+        self.time_var = tk.StringVar()
+        time_entry = ttk.Entry(status, textvariable=self.time_var, width=22)
+        time_entry.pack(side=tk.RIGHT, padx=(0, 10))
+        time_entry.bind('<Return>', lambda e: self.go_to_time())
+        ttk.Label(status, text="Go to time:").pack(side=tk.RIGHT)
+
+        self.toggle_density(draw=False)
+        self.show(len(self.replay))
+
+    def show(self, position):
+        """Seek to position and draw the roster as it was there"""
+        self.replay.seek(position)
+        changed = self.replay.take_changes()
+        names, xy = self.replay.names, self.replay.positions()
+
+        if self.density_var.get():
+            self.density.rebuild(xy)
+        elif changed is None or len(changed) > len(names) // 4:
+            self.renderer.replace(zip(names, *xy.T.tolist()))
+        else:
+            rows = self.replay.rows
+            gone = [name for name in changed if name not in rows]
+            for name in gone:
+                self.renderer.remove(name)
+            for name in changed:
+                if name not in rows:
+                    continue
+                x, y = xy[rows[name]]
+                if name in self.renderer.rows:
+                    self.renderer.move(name, x, y)
+                else:
+                    self.renderer.add(name, x, y)
+
+        position = self.replay.position
+        self.position_var.set(position)
+        self.status_var.set(f"Edit {position} of {len(self.replay)}  {self.replay.timestamp(position) or 'Start'}"
+                            f"  {len(names)} people")
+        self.renderer.layout_labels()
+        self.heatmap.update()
+        self.canvas.draw_idle()
+
+    def toggle_density(self, draw=True):
+        """Swap between markers and the heatmap, refilling whichever is now shown"""
+        density = self.density_var.get()
+        self.heatmap.set_visible(density)
+        self.renderer.set_visible(not density)
+        self.replay.changed = None  # Whichever is shown now missed the edits made while hidden
+        if draw:
+            self.show(self.replay.position)
+
+    def on_scrub(self, value):
+        self.stop()
+        position = int(round(float(value)))
+        if position != self.replay.position:
+            self.show(position)
+
+    def go_to_time(self):
+        """Seek to the end of the edits made at or before the typed timestamp (any prefix of one works)"""
+        text = self.time_var.get().strip()
+        if text:
+            self.stop()
+            # Pad a prefix like "2025-07-30 15:12" so it covers the whole minute
+            self.show(self.replay.index_at(text + "\uffff"))
+
+    def toggle_play(self):
+        if self.play_job is not None:
+            self.stop()
+            return
+        if self.replay.position >= len(self.replay):
+            self.show(0)  # Start again from the beginning
+        self.play_btn.config(text="Pause")
+        self.last_frame = time.perf_counter()
+        self.carry = 0.0
+        self.play_job = self.window.after(self.frame_ms, self.play_frame)
+
+    def play_frame(self):
+        """Advance by the edits due since the previous frame, then schedule the next one"""
+        now = time.perf_counter()
+        due = self.SPEEDS[self.speed_box.current()] * (now - self.last_frame) + self.carry
+        self.last_frame = now
+        steps = int(due)
+        self.carry = due - steps
+        self.show(self.replay.position + steps)
+        if self.replay.position >= len(self.replay):
+            self.stop()
+        else:
+            self.play_job = self.window.after(self.frame_ms, self.play_frame)
+
+    def stop(self):
+        if self.play_job is not None:
+            self.window.after_cancel(self.play_job)
+            self.play_job = None
+        self.play_btn.config(text="Play")
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
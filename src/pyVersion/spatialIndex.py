@@ -0,0 +1,153 @@
+import heapq
+import math
+
+
+class GridIndex:
+    """Uniform grid of buckets over the compass for fast point lookups"""
+
+    def __init__(self, cell_size=5.0):
+        self.cell_size = cell_size
+        self.cells = {}  # {(col, row): {name: (x, y)}}
+        self.cell_of = {}  # {name: (col, row)}
+
+    def __len__(self):
+        return len(self.cell_of)
+
+    def __contains__(self, name):
+        return name in self.cell_of
+
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, name, x, y):
+        """Add a point, replacing any previous position for the same name"""
+        if name in self.cell_of:
+            self.move(name, x, y)
+            return
+        cell = self._cell(x, y)
+        self.cells.setdefault(cell, {})[name] = (x, y)
+        self.cell_of[name] = cell
+
+    def move(self, name, x, y):
+        """Update a point, only touching buckets when it crosses a cell boundary"""
+        old_cell = self.cell_of.get(name)
+        if old_cell is None:
+            self.insert(name, x, y)
+            return
+
+        new_cell = self._cell(x, y)
+        if new_cell != old_cell:
+            bucket = self.cells[old_cell]
+            del bucket[name]
+            if not bucket:
+                del self.cells[old_cell]
+            self.cell_of[name] = new_cell
+        self.cells.setdefault(new_cell, {})[name] = (x, y)
+
+    def remove(self, name):
+        cell = self.cell_of.pop(name, None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        del bucket[name]
+        if not bucket:
+            del self.cells[cell]
+
+    def remove_many(self, names):
+        for name in names:
+            self.remove(name)
+
+    def clear(self):
+        self.cells.clear()
+        self.cell_of.clear()
+
+    def query_box(self, x_min, x_max, y_min, y_max):
+        """Yield (name, x, y) for every point inside the box"""
+        col_min, row_min = self._cell(x_min, y_min)
+        col_max, row_max = self._cell(x_max, y_max)
+
+        # Sparse rosters can have fewer occupied cells than the box covers
+        if (col_max - col_min + 1) * (row_max - row_min + 1) > len(self.cells):
+            cells = [c for c in self.cells if col_min <= c[0] <= col_max and row_min <= c[1] <= row_max]
+        else:
+            cells = [(c, r) for c in range(col_min, col_max + 1) for r in range(row_min, row_max + 1)]
+
+        for cell in cells:
+            for name, (x, y) in self.cells.get(cell, {}).items():
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    yield name, x, y
+
+    def nearest(self, x, y, radius, scale_x=1.0, scale_y=1.0):
+        """Return the closest name within radius, or None
+
+        scale_x and scale_y convert data units into the space the radius is
+        measured in (e.g. pixels per data unit), so hit-testing can happen in
+        screen space even when the axes are not equally scaled.
+        """
+        reach_x = radius / scale_x
+        reach_y = radius / scale_y
+
+        best_name = None
+        best_dist = radius * radius
+        for name, px, py in self.query_box(x - reach_x, x + reach_x, y - reach_y, y + reach_y):
+            dist = ((px - x) * scale_x) ** 2 + ((py - y) * scale_y) ** 2
+            if dist <= best_dist:
+                best_name = name
+                best_dist = dist
+        return best_name
+
+    def within(self, x, y, radius):
+        """Return [(distance, name)] for every point within radius of (x, y), nearest first"""
+        found = []
+        for name, px, py in self.query_box(x - radius, x + radius, y - radius, y + radius):
+            distance = math.hypot(px - x, py - y)
+            if distance <= radius:
+                found.append((distance, name))
+        found.sort()
+        return found
+
+    def k_nearest(self, x, y, k, exclude=()):
+        """Return [(distance, name)] for the k points closest to (x, y), nearest first
+
+        Cells are searched in square rings outwards from the one holding
+        (x, y). Every point in ring r is at least (r - 1) * cell_size away, so
+        the search stops as soon as that is further than the k-th closest
+        point found so far, or once the rings have passed every occupied cell.
+        Rings are only walked across the occupied area.
+        """
+        if k <= 0 or not self.cells:
+            return []
+        col, row = self._cell(x, y)
+        cols = [c for c, _ in self.cells]
+        rows = [r for _, r in self.cells]
+        # Rings before first are empty, and rings after last cannot hold anyone
+        first = max(min(cols) - col, col - max(cols), min(rows) - row, row - max(rows), 0)
+        last = max(col - min(cols), max(cols) - col, row - min(rows), max(rows) - row)
+
+        best = []  # Max-heap of (-distance, name) holding the closest k so far
+        for ring in range(first, last + 1):
+            if len(best) == k and (ring - 1) * self.cell_size > -best[0][0]:
+                break
+            for cell in self._ring(col, row, ring):
+                for name, (px, py) in self.cells.get(cell, {}).items():
+                    if name in exclude:
+                        continue
+                    distance = math.hypot(px - x, py - y)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, name))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, name))
+        return sorted((-distance, name) for distance, name in best)
+
+    def _ring(self, col, row, ring):
+        """Cells on the square ring ring cells out from (col, row)"""
+        if ring == 0:
+            return [(col, row)]
+        if 8 * ring > len(self.cells):
+            # Sparse rosters can have fewer occupied cells than the ring covers
+            return [c for c in self.cells if max(abs(c[0] - col), abs(c[1] - row)) == ring]
+        cells = [(c, row - ring) for c in range(col - ring, col + ring + 1)]
+        cells += [(c, row + ring) for c in range(col - ring, col + ring + 1)]
+        cells += [(col - ring, r) for r in range(row - ring + 1, row + ring)]
+        cells += [(col + ring, r) for r in range(row - ring + 1, row + ring)]
+        return cells
@@ -0,0 +1,492 @@
+"""Local sync server so several compass windows can share one roster
+
+Run from this directory:
+
+    python syncServer.py                  # serves personality_compass_data/ on 127.0.0.1:8765
+    python newMain.py --sync              # in every window that should share it
+
+The server owns the roster and is the only process writing its files.
+Windows talk to it over TCP with one JSON message per line. Every edit a
+window logs is sent as a compact delta (plus the history entry, for the
+server's journal). The server applies deltas in arrival order and echoes
+each one to every window, including the sender, so all of them converge
+on the server's order. Live drag positions are not committed edits: each
+window sends at most one per drag_interval, and the server merges them per
+person and broadcasts them at most every broadcast_interval.
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from peopleStore import PeopleStore
+from persistence import BackgroundWriter, JsonStorage, SqliteStorage
+from renderer import COMPASS_AXES
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+LINE_LIMIT = 1 << 28  # Snapshots and imports of large rosters are single lines
+
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + "\n").encode('utf-8')
+
+
+def parse_address(address):
+    host, _, port = (address or DEFAULT_ADDRESS).rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def delta_message(entry):
+    """Turn a log_edit entry into a compact delta for the server, or None if it changes nobody"""
+    action = entry.get("action")
+    details = entry.get("details", {})
+
+    if action == "person_added":
+        position = details["position"]
+        return {"op": "add", "name": details["name"], "x": position["x"], "y": position["y"],
+                "date": details.get("date_added", "Unknown"), "traits": details.get("traits", [])}
+    if action in ("person_moved", "coordinates_edited"):
+        position = details["new_position"]
+        return {"op": "move", "name": details["name"], "x": position["x"], "y": position["y"]}
+    if action == "traits_edited":
+        return {"op": "traits", "name": details["name"], "axes": details["axes"], "values": details["new_values"]}
+    if action == "person_removed":
+        return {"op": "remove", "name": details["name"]}
+    if action in ("people_imported", "people_restored"):
+        people = details["people"]
+        return {"op": "add_many", "names": list(people), "date": entry.get("timestamp", "Unknown")[:19],
+                "xy": [[p["x"], p["y"]] + p.get("traits", []) for p in people.values()]}
+    if action == "people_removed":
+        return {"op": "remove_many", "names": list(details["people"])}
+    if action == "all_people_cleared":
+        return {"op": "clear"}
+    return None
+
+
+class SyncServer:
+    """Authoritative roster shared by every connected compass window
+
+    All state lives on the asyncio loop thread; files are written by a
+    BackgroundWriter in the same formats the app uses, so the data folder
+    can be opened without the server again afterwards.
+    """
+
+    def __init__(self, storage, host="127.0.0.1", port=8765, broadcast_interval=0.05, save_delay=0.5):
+        self.storage = storage
+        self.host = host
+        self.port = port
+        self.broadcast_interval = broadcast_interval
+        self.save_delay = save_delay
+        self.people = PeopleStore()
+        self.axis_names = list(COMPASS_AXES)
+        self.metadata = {}
+        self.session_entries = []  # History entries received since the server started
+        self.clients = {}  # {client id: (writer, number of session entries when it connected)}
+        self.next_client = 1
+        self.pending_drags = {}  # {name: (client id, drag message)} newest live position per person
+        self.drag_starts = {}  # {name: (client id, trait vector before the drag)}
+        self.drag_flush = None  # loop.call_later handle of the next drag broadcast
+        self.save_pending = None
+        self.changed_people = set()
+        self.removed_people = set()
+        self.people_cleared = False
+        self.writer = None
+        self.server = None
+
+    def load(self):
+        """Read the roster from storage, as PersonalityCompass.load_data does"""
+        loaded = self.storage.load()
+        if loaded is None:
+            return
+        self.metadata, people_data = loaded
+        axes = self.metadata.get("axes") or []
+        self.axis_names.extend(axes[len(self.axis_names):])
+        while self.people.dims < len(self.axis_names):
+            self.people.add_axis()
+        self.people.add_many(((name, p['x'], p['y'], p.get('date_added', 'Unknown'), p.get('quadrant'))
+                              for name, p in people_data.items()),
+                             (p.get('traits') for p in people_data.values()))
+        print(f"Loaded {len(self.people)} people from {self.storage.describe()}")
+
+    async def serve(self):
+        self.load()
+        self.writer = BackgroundWriter(self.storage)
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, limit=LINE_LIMIT)
+        print(f"Sharing {self.storage.describe()} on {self.host}:{self.port}")
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.save()
+            self.writer.close()
+
+    def snapshot(self):
+        """The whole roster as sent to a window when it connects"""
+        vectors = self.people.vectors.tolist()
+        return {
+            "op": "snapshot",
+            "axes": self.axis_names,
+            "total_edits": self.metadata.get("total_edits", 0) + len(self.session_entries),
+            "last_updated": self.metadata.get("last_updated", "Unknown"),
+            "people": [[record.name, record.date_added] + vector for record, vector in zip(self.people.records, vectors)]
+        }
+
+    async def handle_client(self, reader, writer):
+        client = self.next_client
+        self.next_client += 1
+        self.clients[client] = (writer, len(self.session_entries))
+        writer.write(encode(self.snapshot()))
+        print(f"Client {client} connected ({len(self.clients)} connected)")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    self.receive(client, json.loads(line))
+                except Exception as e:
+                    print(f"Error applying message from client {client}: {e}")
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            print(f"Client {client} dropped: {e}")
+        finally:
+            self.disconnect(client)
+
+    def disconnect(self, client):
+        if self.clients.pop(client, None) is None:
+            return
+        # Drags the window never finished go back to where they started, as Escape would
+        for name, (origin, _) in list(self.drag_starts.items()):
+            if origin == client:
+                self.cancel_drag(name)
+        print(f"Client {client} disconnected ({len(self.clients)} connected)")
+
+    def cancel_drag(self, name, skip=None):
+        """Put a dragged person back where the drag began and tell the other windows"""
+        origin, vector = self.drag_starts.pop(name)
+        self.pending_drags.pop(name, None)
+        if name in self.people:
+            self.people.set_traits(name, range(self.people.dims), vector)
+        self.broadcast({"op": "drag_cancel", "name": name}, skip=skip)
+
+    def send(self, client, message):
+        """Queue a message for one window, dropping it if it stopped reading"""
+        if client not in self.clients:
+            return
+        writer = self.clients[client][0]
+        if writer.transport.get_write_buffer_size() > LINE_LIMIT:
+            writer.close()  # It can reconnect for a fresh snapshot
+            self.disconnect(client)
+            return
+        writer.write(message if isinstance(message, bytes) else encode(message))
+
+    def broadcast(self, message, skip=None):
+        data = encode(message)
+        for client in list(self.clients):
+            if client != skip:
+                self.send(client, data)
+
+    def receive(self, client, message):
+        op = message.get("op")
+        if op == "drag":
+            name = message["name"]
+            if name not in self.people:
+                return
+            if name not in self.drag_starts:
+                self.drag_starts[name] = (client, self.people[name].traits)
+            self.people.set_traits(name, message["axes"], message["values"])
+            self.pending_drags[name] = (client, message)
+            if self.drag_flush is None:
+                self.drag_flush = asyncio.get_running_loop().call_later(self.broadcast_interval, self.flush_drags)
+        elif op == "drag_cancel":
+            if message["name"] in self.drag_starts:
+                self.cancel_drag(message["name"], skip=client)
+        elif op == "history":
+            entries = self.storage.load_history() + self.session_entries[:self.clients[client][1]]
+            self.send(client, {"op": "history", "entries": entries})
+        elif op == "log":
+            self.record(message["entry"])
+        elif op == "axis":
+            self.people.add_axis()
+            self.axis_names.append(message["name"])
+            self.record({"timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3],
+                         "action": "axis_added", "details": {"axis": self.people.dims - 1, "name": message["name"]}})
+            self.broadcast({"op": "axis", "name": message["name"], "axis": self.people.dims - 1})
+            self.schedule_save()
+        else:
+            entry = message.pop("entry", None)
+            failed = self.apply(message)
+            if failed:
+                # The sender's copy disagrees with the roster; send it the real state of those people
+                self.send(client, {"op": "fix", "people": {name: self.person_state(name) for name in failed}})
+            if len(failed) < len(message.get("names", [message.get("name")])):
+                self.broadcast(message)
+                if entry is not None:
+                    self.record(entry)
+
+    def record(self, entry):
+        self.session_entries.append(entry)
+        self.writer.append_edit(entry)
+
+    def apply(self, message):
+        """Apply a committed delta to the roster; returns the names it did not fit"""
+        op = message["op"]
+        name = message.get("name")
+        if op in ("move", "traits", "remove") and name not in self.people:
+            return [name]
+        if name is not None:
+            # A committed edit supersedes any live drag of the same person
+            self.drag_starts.pop(name, None)
+            self.pending_drags.pop(name, None)
+
+        if op == "add":
+            if name in self.people:
+                return [name]
+            self.people.add(name, message["x"], message["y"], message["date"], None, message.get("traits"))
+            self.mark_changed([name])
+        elif op in ("move", "traits"):
+            if op == "move":
+                self.people.move(name, message["x"], message["y"])
+            else:
+                self.people.set_traits(name, message["axes"], message["values"])
+            self.people.reclassify(name)
+            self.mark_changed([name])
+        elif op == "remove":
+            self.people.remove(name)
+            self.mark_removed([name])
+        elif op == "add_many":
+            keep = [i for i, person in enumerate(message["names"]) if person not in self.people]
+            names = [message["names"][i] for i in keep]
+            if names:
+                self.people.add_arrays(names, np.array(message["xy"], dtype=float)[keep], message["date"])
+                self.mark_changed(names)
+            return [person for person in message["names"] if person not in names]
+        elif op == "remove_many":
+            names = [person for person in message["names"] if person in self.people]
+            for person in names:
+                self.people.remove(person)
+            self.mark_removed(names)
+            return [person for person in message["names"] if person not in names]
+        elif op == "clear":
+            self.people.clear()
+            self.drag_starts.clear()
+            self.pending_drags.clear()
+            self.changed_people.clear()
+            self.removed_people.clear()
+            self.people_cleared = True
+            self.schedule_save()
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+        return []
+
+    def person_state(self, name):
+        """[date_added, x, y, *traits] of one person, or None if they are not on the roster"""
+        record = self.people.get(name)
+        return None if record is None else [record.date_added] + record.traits
+
+    def flush_drags(self):
+        """Broadcast the newest live position of every person being dragged, once per interval"""
+        self.drag_flush = None
+        drags = self.pending_drags
+        self.pending_drags = {}
+        for client in list(self.clients):
+            moves = [[name, message["axes"], message["values"]]
+                     for name, (origin, message) in drags.items() if origin != client]
+            if moves:
+                self.send(client, {"op": "drags", "moves": moves})
+
+    def mark_changed(self, names):
+        self.removed_people.difference_update(names)
+        self.changed_people.update(names)
+        self.schedule_save()
+
+    def mark_removed(self, names):
+        self.changed_people.difference_update(names)
+        self.removed_people.update(names)
+        self.schedule_save()
+
+    def schedule_save(self):
+        if self.save_pending is None:
+            self.save_pending = asyncio.get_running_loop().call_later(self.save_delay, self.save)
+
+    def save(self):
+        """Queue a save in the same format as PersonalityCompass.save_data"""
+        self.save_pending = None
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        metadata = {
+            "last_updated": now,
+            "total_people": len(self.people),
+            "version": "2.2",
+            "total_edits": self.metadata.get("total_edits", 0) + len(self.session_entries)
+        }
+        if self.people.dims > 2:
+            metadata["axes"] = list(self.axis_names)
+
+        names = self.people.names() if self.storage.full_snapshots else self.changed_people & set(self.people)
+        people = {}
+        for name in names:
+            person = self.people[name]
+            people[name] = {'x': person.x, 'y': person.y, 'quadrant': person.quadrant,
+                            'date_added': person.date_added, 'last_moved': now}
+            if self.people.dims > 2:
+                people[name]['traits'] = person.traits[2:]
+
+        self.writer.submit(metadata, people, deleted=list(self.removed_people), cleared=self.people_cleared)
+        self.changed_people.clear()
+        self.removed_people.clear()
+        self.people_cleared = False
+
+
+class SyncStorage:
+    """Storage backend that shares the roster through a SyncServer instead of local files
+
+    load connects and returns the server's roster. The BackgroundWriter
+    hands every logged edit to append_edits, which sends it as a delta;
+    saves are ignored because the server writes the files. Messages from
+    the server wait in a queue for the Tk thread to collect with receive.
+    The connection runs on its own asyncio thread.
+    """
+
+    full_snapshots = False
+
+    def __init__(self, address=DEFAULT_ADDRESS, drag_interval=0.05):
+        self.host, self.port = parse_address(address)
+        self.drag_interval = drag_interval
+        self.needs_resave = False
+        self.incoming = queue.Queue()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="compass-sync", daemon=True)
+        self.thread.start()
+        self.stream = None  # asyncio StreamWriter once connected
+        self.pending_drag = None  # Newest drag message not sent yet
+        self.drag_flush = None
+        self.history = None  # Future for an outstanding history request
+
+    def describe(self):
+        return f"sync server {self.host}:{self.port}"
+
+    def load(self):
+        """Connect and return the shared (metadata, people)"""
+        try:
+            snapshot = asyncio.run_coroutine_threadsafe(self._connect(), self.loop).result(timeout=30)
+        except Exception as e:
+            self.incoming.put({"op": "disconnected", "reason": str(e) or type(e).__name__})
+            raise
+        people = {row[0]: {'x': row[2], 'y': row[3], 'date_added': row[1], 'traits': row[4:]}
+                  for row in snapshot["people"]}
+        metadata = {"axes": snapshot["axes"], "total_edits": snapshot["total_edits"],
+                    "total_people": len(people), "last_updated": snapshot["last_updated"]}
+        return metadata, people
+
+    async def _connect(self):
+        reader, self.stream = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        snapshot = json.loads(await reader.readline())
+        self.loop.create_task(self._read(reader))
+        return snapshot
+
+    async def _read(self, reader):
+        reason = "the server closed the connection"
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get("op") == "history" and self.history is not None:
+                    self.history.set_result(message["entries"])
+                else:
+                    self.incoming.put(message)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            reason = str(e)
+        self.stream = None
+        self.incoming.put({"op": "disconnected", "reason": reason})
+
+    def receive(self):
+        """Every message received since the last call (Tk thread)"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.incoming.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def send(self, message):
+        """Send a committed message from any thread; it supersedes a drag still waiting to go out"""
+        self.loop.call_soon_threadsafe(self._send, encode(message))
+
+    def send_drag(self, name, axes, values):
+        """Send a live drag position, at most once per drag_interval (Tk thread)"""
+        self.loop.call_soon_threadsafe(self._queue_drag, {"op": "drag", "name": name, "axes": list(axes),
+                                                          "values": list(values)})
+
+    def _queue_drag(self, message):
+        self.pending_drag = message
+        if self.drag_flush is None:
+            self.drag_flush = self.loop.call_later(self.drag_interval, self._flush_drag)
+
+    def _flush_drag(self):
+        self.drag_flush = None
+        if self.pending_drag is not None:
+            self._send(encode(self.pending_drag))
+
+    def _send(self, data):
+        # Whatever goes out next is newer than a drag still waiting
+        self.pending_drag = None
+        if self.stream is not None:
+            self.stream.write(data)
+
+    def append_edits(self, entries):
+        for entry in entries:
+            message = delta_message(entry) or {"op": "log"}
+            message["entry"] = entry
+            self.send(message)
+
+    def save(self, metadata, people, deleted=(), cleared=False):
+        """The server writes the files"""
+
+    def load_history(self):
+        """Ask the server for the edits made before this window connected"""
+        async def request():
+            self.history = self.loop.create_future()
+            self._send(encode({"op": "history"}))
+            try:
+                return await asyncio.wait_for(self.history, 30)
+            finally:
+                self.history = None
+        return asyncio.run_coroutine_threadsafe(request(), self.loop).result()
+
+    def close(self):
+        """Send anything still queued, then disconnect (BackgroundWriter thread)"""
+        async def disconnect():
+            if self.stream is not None:
+                self.stream.close()
+                await self.stream.wait_closed()
+        try:
+            asyncio.run_coroutine_threadsafe(disconnect(), self.loop).result(timeout=5)
+        except Exception as e:
+            print(f"Error closing sync connection: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share one Personality Compass roster between windows")
+    parser.add_argument("--address", default=DEFAULT_ADDRESS, help=f"host:port to listen on (default: {DEFAULT_ADDRESS})")
+    parser.add_argument("--data-dir", default="personality_compass_data", help="folder holding the shared roster")
+    parser.add_argument("--sqlite", action="store_true", help="keep the roster in SQLite (migrates existing JSON data)")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    storage = SqliteStorage(args.data_dir) if args.sqlite else JsonStorage(args.data_dir)
+    host, port = parse_address(args.address)
+    try:
+        asyncio.run(SyncServer(storage, host, port).serve())
+    except KeyboardInterrupt:
+        print("Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from collections import deque
+
+import numpy as np
+
+
+def delta_from_entry(entry):
+    """Turn an edit history entry into an undoable delta, or None
+
+    Deltas are small tuples that can be applied forwards (redo) or inverted
+    (undo):
+
+        ("add", name, x, y, date_added, extra)
+        ("remove", name, x, y, date_added, extra)
+        ("move", name, old_x, old_y, x, y)
+        ("traits", name, axes, old_values, values)  # A move along any two axes
+        ("add_many", names, xy, dates)      # xy is an (n, 2 + extra axes) float array
+        ("remove_many", names, xy, dates)   # Only produced by inverting add_many
+        ("clear", names, xy, dates)
+
+    extra lists the values on the axes after x and y. dates is either one
+    date string shared by everyone or a list per person.
+
+    Clears only log names, so their delta is built by the caller from the
+    store's arrays and passed to UndoHistory.record directly.
+    """
+    action = entry.get("action")
+    details = entry.get("details", {})
+
+    if action == "person_added":
+        position = details["position"]
+        date_added = details.get("date_added", entry.get("timestamp", "Unknown")[:19])
+        return ("add", details["name"], position["x"], position["y"], date_added, details.get("traits", []))
+    if action == "person_removed":
+        position = details["position"]
+        return ("remove", details["name"], position["x"], position["y"], details.get("date_added", "Unknown"),
+                details.get("traits", []))
+    if action in ("person_moved", "coordinates_edited") and "old_position" in details:
+        old, new = details["old_position"], details["new_position"]
+        if old == new:
+            return None  # A click without a drag
+        return ("move", details["name"], old["x"], old["y"], new["x"], new["y"])
+    if action == "traits_edited":
+        if details["old_values"] == details["new_values"]:
+            return None
+        return ("traits", details["name"], tuple(details["axes"]), details["old_values"], details["new_values"])
+    if action == "people_imported":
+        people = details["people"]
+        xy = np.array([[p["x"], p["y"]] + p.get("traits", []) for p in people.values()], dtype=float)
+        return ("add_many", list(people), xy.reshape(len(people), -1) if people else xy.reshape(0, 2),
+                entry.get("timestamp", "Unknown")[:19])
+    return None
+
+
+def invert(delta):
+    """Return the delta that undoes delta"""
+    kind = delta[0]
+    if kind == "add":
+        return ("remove",) + delta[1:]
+    if kind == "remove":
+        return ("add",) + delta[1:]
+    if kind == "move":
+        name, old_x, old_y, x, y = delta[1:]
+        return ("move", name, x, y, old_x, old_y)
+    if kind == "traits":
+        name, axes, old_values, values = delta[1:]
+        return ("traits", name, axes, values, old_values)
+    if kind == "add_many":
+        return ("remove_many",) + delta[1:]
+    if kind == "clear":
+        return ("add_many",) + delta[1:]
+    raise ValueError(f"Cannot invert {kind!r}")
+
+
+def delta_size(delta):
+    """Number of people a delta holds"""
+    return len(delta[1]) if delta[0] in ("add_many", "remove_many", "clear") else 1
+
+
+class UndoHistory:
+    """Bounded undo and redo stacks of deltas
+
+    Only deltas are kept, never roster snapshots. Bulk deltas hold a name
+    list and a float array (16 bytes per position). Once the stack holds
+    more than max_people positions in total, the oldest steps are dropped.
+    """
+
+    def __init__(self, limit=1000, max_people=1_000_000):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+        self.max_people = max_people
+        self.people_held = 0  # Positions held across the undo stack
+
+    def __len__(self):
+        return len(self.undo_stack)
+
+    def _push(self, delta):
+        if len(self.undo_stack) == self.undo_stack.maxlen:
+            self.people_held -= delta_size(self.undo_stack[0])
+        self.undo_stack.append(delta)
+        self.people_held += delta_size(delta)
+        while self.people_held > self.max_people and len(self.undo_stack) > 1:
+            self.people_held -= delta_size(self.undo_stack.popleft())
+
+    def record(self, delta):
+        """Push a new user edit; this invalidates anything that could be redone"""
+        self._push(delta)
+        self.redo_stack.clear()
+
+    def pop_undo(self):
+        """Return the delta to apply to undo the latest edit, or None"""
+        if not self.undo_stack:
+            return None
+        delta = self.undo_stack.pop()
+        self.people_held -= delta_size(delta)
+        self.redo_stack.append(delta)
+        return invert(delta)
+
+    def pop_redo(self):
+        """Return the delta to apply to redo the latest undone edit, or None"""
+        if not self.redo_stack:
+            return None
+        delta = self.redo_stack.pop()
+        self._push(delta)
+        return delta
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.people_held = 0